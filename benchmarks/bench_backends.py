@@ -0,0 +1,70 @@
+"""
+Compare the python (dict or compact postings) and sparse (CSR) RetrievalSystem backends:
+build time, approximate size of the scoring structures and per-query latency
+on the sample corpus.
+
+Run from the project root:  python benchmarks/bench_backends.py
+"""
+
+import pathlib
+import sys
+import time
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from sample_corpus import get_sample_corpus
+from nlp.compact_index import CompactShard
+from nlp.retrieval_system import RetrievalSystem
+from nlp.sparse_backend import sparse_backend_available
+
+QUERIES = {
+    'en': ['kakatiya dynasty', 'Rudrama Devi queen', 'temple architecture warangal',
+           'chola navy sri lanka', 'krishnadevaraya hampi'],
+    'te': ['కాకతీయ వంశం', 'రుద్రమదేవి', 'విజయనగర సామ్రాజ్యం', 'వరంగల్ కోట'],
+}
+
+
+def build(corpus, backend):
+    start = time.perf_counter()
+    rs = RetrievalSystem(corpus, cache_size=0, backend=backend)
+    return rs, time.perf_counter() - start
+
+
+def scoring_bytes(rs, language):
+    """Approximate size of the structures the backend scores with"""
+    if rs.backend == 'sparse':
+        return rs.sparse_indices[language].memory_bytes()
+    total = 0
+    for shard in rs.postings[language].values():
+        if isinstance(shard, CompactShard):
+            total += shard.memory_bytes()
+            continue
+        for plist in shard.values():
+            total += sys.getsizeof(plist) + len(plist) * (sys.getsizeof((0, 0.0)) + 24)
+    return total
+
+
+def main(repeat=20):
+    if not sparse_backend_available():
+        print("numpy/scipy not installed; only the python backend is available.")
+        return
+    corpus = get_sample_corpus()
+
+    for backend in RetrievalSystem.BACKENDS:
+        rs, build_time = build(corpus, backend)
+        print(f"{backend:>6}: build {build_time:.2f}s")
+        for lang, queries in QUERIES.items():
+            vectors = [rs._vectorize_query(q, lang) for q in queries]
+            start = time.perf_counter()
+            for _ in range(repeat):
+                for qv in vectors:
+                    rs._rank_documents(qv, lang, None, 5)
+            per_query = (time.perf_counter() - start) / (repeat * len(vectors))
+            print(f"        [{lang}] scoring structures ~{scoring_bytes(rs, lang) / 1e6:.2f} MB, "
+                  f"{per_query * 1000:.3f} ms/query")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+BM25 against TF-IDF cosine in RetrievalSystem on the sample corpus: ranking
+latency of cosine, exhaustive BM25 and BM25 with MaxScore pruning, and the
+overlap of the BM25 top-5 with the cosine top-5. Queries are windows of 1-6
+words cut from the corpus paragraphs.
+
+Run from the project root:  python benchmarks/bench_bm25.py [num_queries]
+"""
+
+import pathlib
+import random
+import sys
+import time
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from nlp.retrieval_system import RetrievalSystem
+from sample_corpus import get_sample_corpus
+
+
+def make_queries(docs, n, seed=0):
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(n):
+        words = rng.choice(docs)['text'].split()
+        size = rng.randint(1, 6)
+        start = rng.randrange(max(1, len(words) - size + 1))
+        queries.append(' '.join(words[start:start + size]))
+    return queries
+
+
+def timed(rank, queries):
+    start = time.perf_counter()
+    results = [[doc_id for doc_id, _ in rank(q)] for q in queries]
+    return results, (time.perf_counter() - start) / len(queries)
+
+
+def overlap(a, b):
+    return sum(len(set(x) & set(y)) / len(x) if x else float(not y) for x, y in zip(a, b)) / len(a)
+
+
+def main(num_queries=300, top_k=5):
+    corpus = get_sample_corpus()
+    system = RetrievalSystem(corpus, cache_size=0)
+    for language in ('en', 'te'):
+        queries = make_queries([d for d in corpus if d['language'] == language], num_queries)
+        system._ensure_fresh(language)
+        for q in queries:  # fill the per-term idf / bound memos
+            system._rank_bm25(q, language, None, top_k)
+
+        cosine, t_cosine = timed(lambda q: system._rank_documents(
+            system._vectorize_query(q, language), language, None, top_k), queries)
+        exhaustive, t_exhaustive = timed(lambda q: system._rank_bm25(
+            q, language, None, top_k, prune=False), queries)
+        pruned, t_pruned = timed(lambda q: system._rank_bm25(q, language, None, top_k), queries)
+
+        print(f"[{language}] cosine {t_cosine * 1000:6.2f} ms   bm25 exhaustive {t_exhaustive * 1000:6.2f} ms   "
+              f"bm25 maxscore {t_pruned * 1000:6.2f} ms   per query")
+        print(f"     maxscore == exhaustive: {sum(a == b for a, b in zip(pruned, exhaustive))}/{len(queries)}   "
+              f"top-{top_k} overlap bm25 vs cosine: {overlap(cosine, pruned):.3f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
@@ -0,0 +1,85 @@
+"""
+Scaling of the labeled-Telugu corpus assembly step: the previous per-paragraph
+rescan of the growing corpus vs. sample_corpus.append_labeled_telugu (one
+pass, per-(kingdom, language) counters, incremental JSON parsing). Synthetic
+labeled-paragraph files are generated from the real ones.
+
+Run from the project root:  python benchmarks/bench_corpus_assembly.py [max_paragraphs]
+"""
+
+import json
+import os
+import pathlib
+import sys
+import tempfile
+import time
+import tracemalloc
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from sample_corpus import append_labeled_telugu, sample_data
+
+SIZES = (1_000, 10_000, 30_000, 100_000)
+LEGACY_MAX = 10_000  # the quadratic loop takes minutes beyond this
+
+
+def legacy_append(corpus, labeled_path):
+    """Previous get_sample_corpus loop"""
+    with open(labeled_path, 'r', encoding='utf-8') as f:
+        labeled = json.load(f)
+    for key, item in sorted(labeled.items(), key=lambda x: int(x[0])):
+        para = item.get('paragraph', '').strip()
+        kingdoms = item.get('kingdoms', [])
+        if not para or not kingdoms:
+            continue
+        if not any('\u0C00' <= ch <= '\u0C7F' for ch in para):
+            continue
+        kingdom = kingdoms[0]
+        existing_count = sum(1 for e in corpus if e.get('kingdom_label') == kingdom and e.get('language') == 'te')
+        corpus.append({
+            'paragraph_id': f"{kingdom.lower()}_te_{existing_count+1:03d}",
+            'text': para,
+            'language': 'te',
+            'kingdom_label': kingdom
+        })
+    return corpus
+
+
+def write_labeled(path, n):
+    with open(PROJECT_ROOT / 'data' / 'labeled_paragraphs.json', 'r', encoding='utf-8') as f:
+        real = list(json.load(f).values())
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({str(i): real[i % len(real)] for i in range(n)}, f, ensure_ascii=False, indent=2)
+
+
+def measure(fn, path):
+    tracemalloc.start()
+    start = time.perf_counter()
+    corpus = fn([dict(e) for e in sample_data], path)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return corpus, elapsed, peak
+
+
+def main(max_paragraphs=100_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in (s for s in SIZES if s <= max_paragraphs):
+            path = os.path.join(tmp, f'labeled_{n}.json')
+            write_labeled(path, n)
+            size_mb = os.path.getsize(path) / 1e6
+
+            new, t_new, peak_new = measure(append_labeled_telugu, path)
+            line = (f"{n:>7} paragraphs ({size_mb:6.1f} MB): single pass {t_new:7.2f}s "
+                    f"(peak {peak_new / 1e6:6.1f} MB)")
+            if n <= LEGACY_MAX:
+                old, t_old, peak_old = measure(legacy_append, path)
+                line += (f"   rescan {t_old:7.2f}s (peak {peak_old / 1e6:6.1f} MB)"
+                         f"   identical: {old == new}")
+            print(line)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
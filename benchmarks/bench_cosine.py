@@ -0,0 +1,82 @@
+"""
+Micro-benchmark: per-query cost of cosine scoring on the sample corpus.
+
+Compares the original union-of-keys cosine (norms recomputed per pair) against
+the cached-norm sparse dot product used by RetrievalSystem.
+
+Run from the project root:  python benchmarks/bench_cosine.py
+"""
+
+import math
+import pathlib
+import sys
+import time
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from sample_corpus import get_sample_corpus
+from nlp.retrieval_system import RetrievalSystem
+
+QUERIES = {
+    'en': ['kakatiya dynasty', 'Rudrama Devi queen', 'temple architecture warangal',
+           'chola navy sri lanka', 'krishnadevaraya hampi'],
+    'te': ['కాకతీయ వంశం', 'రుద్రమదేవి', 'విజయనగర సామ్రాజ్యం', 'వరంగల్ కోట'],
+}
+
+
+def union_cosine(vec1, vec2):
+    """The pre-optimisation implementation, kept here as the baseline."""
+    all_terms = set(vec1.keys()) | set(vec2.keys())
+    dot = sum(vec1.get(t, 0) * vec2.get(t, 0) for t in all_terms)
+    norm1 = math.sqrt(sum(v**2 for v in vec1.values()))
+    norm2 = math.sqrt(sum(v**2 for v in vec2.values()))
+    if norm1 == 0 or norm2 == 0:
+        return 0.0
+    return dot / (norm1 * norm2)
+
+
+def time_per_query(fn, queries, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for q in queries:
+            fn(q)
+    return (time.perf_counter() - start) / (repeat * len(queries))
+
+
+def main(repeat=20):
+    rs = RetrievalSystem(get_sample_corpus())
+
+    for lang, queries in QUERIES.items():
+        docs = [rs.get_tfidf_vector(lang, i) for i in range(len(rs.paragraph_metadata[lang]))]
+        norms = [rs._vector_norm(d) for d in docs]
+        raw_norms = rs.doc_norms[lang]
+        vectors = {q: rs._vectorize_query(q, lang) for q in queries}
+
+        def baseline(q):
+            qv = vectors[q]
+            return [union_cosine(qv, d) for d in docs]
+
+        def cached_norms(q):
+            qv = vectors[q]
+            qn = rs._vector_norm(qv)
+            return [rs._cosine_similarity(qv, d, qn, n) for d, n in zip(docs, norms)]
+
+        def postings(q):
+            qv = vectors[q]
+            qn = rs._vector_norm(qv)
+            return {i: dot / (qn * raw_norms[i]) for i, dot in rs._score_postings(qv, lang).items()}
+
+        t_base = time_per_query(baseline, queries, repeat)
+        t_norm = time_per_query(cached_norms, queries, repeat)
+        t_post = time_per_query(postings, queries, repeat)
+
+        print(f"[{lang}] {len(docs)} docs, {len(queries)} queries x {repeat}")
+        print(f"  union cosine scan      : {t_base * 1000:8.3f} ms/query")
+        print(f"  cached-norm sparse dot : {t_norm * 1000:8.3f} ms/query  ({t_base / t_norm:5.1f}x)")
+        print(f"  postings + cached norm : {t_post * 1000:8.3f} ms/query  ({t_base / t_post:5.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Bit-parallel edit distance (nlp/edit_distance.py) vs. the list-based
+dynamic programs it replaced in NgramSpellChecker._levenshtein and
+SpellCorrector._edit_distance, over real (typo, candidate) pairs: typos of
+vocabulary words paired with the words sharing a trigram with them.
+
+Run from the project root:  python benchmarks/bench_edit_distance.py [num_pairs]
+"""
+
+import contextlib
+import io
+import pathlib
+import random
+import sys
+import time
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from nlp.bigram import NgramSpellChecker
+from nlp.edit_distance import edit_distance
+
+
+def dp_bounded(a, b, max_dist=2):
+    """Previous NgramSpellChecker._levenshtein"""
+    if a == b:
+        return 0
+    if abs(len(a) - len(b)) > max_dist:
+        return max_dist + 1
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        cur = [i]
+        best = cur[0]
+        for j, cb in enumerate(b, start=1):
+            cost = 0 if ca == cb else 1
+            cur.append(min(prev[j] + 1, cur[j-1] + 1, prev[j-1] + cost))
+            best = min(best, cur[-1])
+        if best > max_dist:
+            return max_dist + 1
+        prev = cur
+    return prev[-1]
+
+
+def dp_full(s1, s2):
+    """Previous SpellCorrector._edit_distance"""
+    if len(s1) < len(s2):
+        return dp_full(s2, s1)
+    if len(s2) == 0:
+        return len(s1)
+    previous_row = list(range(len(s2) + 1))
+    for i, c1 in enumerate(s1):
+        current_row = [i + 1]
+        for j, c2 in enumerate(s2):
+            insertions = previous_row[j + 1] + 1
+            deletions = current_row[j] + 1
+            substitutions = previous_row[j] + (c1 != c2)
+            current_row.append(min(insertions, deletions, substitutions))
+        previous_row = current_row
+    return previous_row[-1]
+
+
+def make_pairs(language, num_pairs, seed=0):
+    rng = random.Random(seed)
+    checker = NgramSpellChecker(count_filter=False)
+    with contextlib.redirect_stdout(io.StringIO()):
+        checker.load_json(language)
+    words = [w for w in sorted(checker.word_counts) if len(w) > 3]
+    pairs = []
+    while len(pairs) < num_pairs:
+        word = rng.choice(words)
+        i = rng.randrange(len(word))
+        typo = word[:i] + rng.choice(word) + word[i+1:]
+        candidates = sorted(checker.get_candidates(typo, 3))
+        pairs.extend((typo, cand) for cand in rng.sample(candidates, min(20, len(candidates))))
+    return pairs[:num_pairs]
+
+
+def timed(fn, pairs, **kwargs):
+    start = time.perf_counter()
+    out = [fn(a, b, **kwargs) for a, b in pairs]
+    return out, time.perf_counter() - start
+
+
+def main(num_pairs=5000):
+    for language in ('en', 'te'):
+        pairs = make_pairs(language, num_pairs)
+        print(f"[{language}] {len(pairs)} pairs, mean lengths "
+              f"{sum(len(a) for a, _ in pairs) / len(pairs):.1f} / {sum(len(b) for _, b in pairs) / len(pairs):.1f}")
+
+        old, t_old = timed(dp_full, pairs)
+        new, t_new = timed(edit_distance, pairs)
+        print(f"  unbounded      DP {t_old * 1000:8.1f} ms   bit-parallel {t_new * 1000:8.1f} ms   "
+              f"identical: {old == new}")
+
+        for max_dist in (2, 5):
+            old, t_old = timed(dp_bounded, pairs, max_dist=max_dist)
+            new, t_new = timed(edit_distance, pairs, max_dist=max_dist)
+            within = all(o == n for o, n in zip(old, new) if o <= max_dist)
+            print(f"  max_dist={max_dist}     DP {t_old * 1000:8.1f} ms   bit-parallel {t_new * 1000:8.1f} ms   "
+                  f"identical within bound: {within}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
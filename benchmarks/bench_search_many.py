@@ -0,0 +1,55 @@
+"""
+Throughput of RetrievalSystem.search_many vs. a loop over search, replaying a
+synthetic query log built from corpus sentences.
+
+Run from the project root:  python benchmarks/bench_search_many.py [num_queries]
+"""
+
+import pathlib
+import random
+import sys
+import time
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from sample_corpus import get_sample_corpus
+from nlp.retrieval_system import RetrievalSystem
+
+
+def make_query_log(corpus, language, n, seed=0):
+    rng = random.Random(seed)
+    texts = [d['text'].split() for d in corpus if d['language'] == language]
+    log = []
+    for _ in range(n):
+        words = rng.choice(texts)
+        start = rng.randrange(max(1, len(words) - 4))
+        log.append(' '.join(words[start:start + rng.randint(2, 5)]))
+    return log
+
+
+def main(num_queries=500):
+    corpus = get_sample_corpus()
+    for backend in RetrievalSystem.BACKENDS:
+        for lang in ('en', 'te'):
+            log = make_query_log(corpus, lang, num_queries)
+
+            rs = RetrievalSystem(corpus, cache_size=0, backend=backend)
+            if rs.backend != backend:
+                continue
+            start = time.perf_counter()
+            single = [rs.search(q, lang, ['Kakatiya']) for q in log]
+            t_single = time.perf_counter() - start
+
+            start = time.perf_counter()
+            batch = rs.search_many(log, lang, ['Kakatiya'])
+            t_batch = time.perf_counter() - start
+
+            same = all(a['paragraphs'] == b['paragraphs'] for a, b in zip(single, batch))
+            print(f"{backend:>6} [{lang}] {num_queries} queries: search {num_queries / t_single:8.0f} q/s, "
+                  f"search_many {num_queries / t_batch:8.0f} q/s  (identical results: {same})")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,73 @@
+"""
+Candidate-set size and get_confident_words latency of NgramSpellChecker on
+the shipped word-count JSONs: unfiltered n-gram candidates, count-filtered
+(length-bucketed) n-gram candidates, and the SymSpell engine. Misspellings
+are generated by applying 1-2 random edits to vocabulary words.
+
+Run from the project root:  python benchmarks/bench_spell_candidates.py [num_tokens]
+"""
+
+import contextlib
+import io
+import pathlib
+import random
+import sys
+import time
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from nlp.bigram import NgramSpellChecker
+
+CONFIGS = [
+    ('ngram, unfiltered', dict(candidate_engine='ngram', count_filter=False)),
+    ('ngram, count filter', dict(candidate_engine='ngram', count_filter=True)),
+    ('symspell', dict(candidate_engine='symspell')),
+]
+
+
+def make_typos(words, n, seed=0):
+    rng = random.Random(seed)
+    words = [w for w in words if len(w) > 3]
+    typos = []
+    for _ in range(n):
+        word = rng.choice(words)
+        for _ in range(rng.randint(1, 2)):
+            i = rng.randrange(len(word))
+            op = rng.choice('dis')
+            if op == 'd':
+                word = word[:i] + word[i+1:]
+            elif op == 's':
+                word = word[:i] + rng.choice(word) + word[i+1:]
+            else:
+                word = word[:i] + rng.choice(word) + word[i:]
+        typos.append(word)
+    return typos
+
+
+def main(num_tokens=100):
+    for lang in ('en', 'te'):
+        for label, kwargs in CONFIGS:
+            checker = NgramSpellChecker(**kwargs)
+            with contextlib.redirect_stdout(io.StringIO()):
+                checker.load_json(lang)
+                start = time.perf_counter()
+                checker.get_candidates('warmup')  # builds the engine's index, if any
+                t_build = time.perf_counter() - start
+            tokens = make_typos(sorted(checker.word_counts), num_tokens)
+
+            sizes = {n: sum(len(checker.get_candidates(t, n)) for t in tokens) / len(tokens)
+                     for n in (1, 2, 3)}
+            start = time.perf_counter()
+            for token in tokens:
+                checker.get_confident_words(token)
+            elapsed = time.perf_counter() - start
+
+            print(f"[{lang}] {label:<20} avg candidates uni/bi/tri "
+                  f"{sizes[1]:7.0f} {sizes[2]:7.0f} {sizes[3]:7.0f}   "
+                  f"{elapsed / len(tokens) * 1000:8.2f} ms/token  (index build {t_build:.2f}s)")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
@@ -0,0 +1,67 @@
+"""
+Throughput of NgramSpellChecker.get_confident_words_tokens in-process vs.
+fanned out to a process pool, by number of tokens per query. The memo is
+disabled so every token is scored.
+
+Run from the project root:  python benchmarks/bench_spell_parallel.py [workers]
+"""
+
+import contextlib
+import io
+import os
+import pathlib
+import random
+import sys
+import time
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from nlp.bigram import NgramSpellChecker
+
+TOKEN_COUNTS = (2, 4, 8, 16, 32, 64)
+QUERIES_PER_COUNT = 3
+
+
+def make_query(words, num_tokens, rng):
+    tokens = []
+    for _ in range(num_tokens):
+        word = rng.choice(words)
+        i = rng.randrange(len(word))
+        tokens.append(word[:i] + rng.choice(word) + word[i+1:])
+    return tokens
+
+
+def run(checker, queries):
+    start = time.perf_counter()
+    for query in queries:
+        checker.get_confident_words_tokens(query)
+    return sum(len(q) for q in queries) / (time.perf_counter() - start)
+
+
+def main(workers=None):
+    workers = workers or max(2, os.cpu_count() or 1)
+    print(f"{os.cpu_count()} CPUs, pool of {workers} workers")
+    for lang in ('en', 'te'):
+        serial = NgramSpellChecker(cache_size=0)
+        parallel = NgramSpellChecker(cache_size=0, workers=workers, parallel_threshold=1)
+        with contextlib.redirect_stdout(io.StringIO()):
+            serial.load_json(lang)
+            parallel.load_json(lang)
+            serial.get_confident_words_tokens(['warmup'])  # builds the count-filter index
+            parallel.get_confident_words_tokens(['warmup'] * workers)  # starts the pool
+
+        rng = random.Random(0)
+        words = [w for w in sorted(serial.word_counts) if len(w) > 3]
+        for num_tokens in TOKEN_COUNTS:
+            queries = [make_query(words, num_tokens, rng) for _ in range(QUERIES_PER_COUNT)]
+            t_serial = run(serial, queries)
+            t_parallel = run(parallel, queries)
+            print(f"[{lang}] {num_tokens:3d} tokens/query: in-process {t_serial:7.1f} tokens/s, "
+                  f"pool {t_parallel:7.1f} tokens/s")
+        parallel.close()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else None)
@@ -0,0 +1,90 @@
+"""
+save_system_state / load_system_state round trip of initialize_system's
+components, built from scratch (snapshot_dir=None) and warm-started from
+snapshots (memory-mapped retrieval and spell indexes). Reports the state file
+size and save / load times, and checks that the reloaded components answer
+searches and spelling queries like the originals, including after one
+language of the warm-started index has been modified (materialized).
+
+Run from the project root:  python benchmarks/bench_system_state.py
+"""
+
+import contextlib
+import io
+import pathlib
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from utils.helpers import initialize_system, load_system_state, save_system_state
+
+QUERIES = {
+    'en': ['kakatiya dynasty', 'temple', 'chola empire navy'],
+    'te': ['కాకతీయ వంశం', 'రాజ్యం', 'శాతవాహనులు'],
+}
+MISSPELLINGS = {'en': ['dynsty', 'kakatia', 'tempel'], 'te': ['కాకతియ', 'రాజయం']}
+NEW_DOC = {'text': 'Kakatiya dynasty temple at Warangal', 'kingdom_label': 'Kakatiya',
+           'language': 'en', 'paragraph_id': 'state_check_en'}
+
+
+def answers(components):
+    retrieval = components['retrieval_system']
+    speller = components['spell_corrector']
+    out = []
+    for language, queries in QUERIES.items():
+        for query in queries:
+            hits = retrieval.search(query, language)['paragraphs']
+            out.append([(hit['paragraph_id'], hit['similarity']) for hit in hits])
+    for language, words in MISSPELLINGS.items():
+        speller.load_json(language)
+        out.extend(speller.get_confident_words(word) for word in words)
+    return out
+
+
+def round_trip(label, components, path):
+    start = time.perf_counter()
+    saved = save_system_state(components, path)
+    t_save = time.perf_counter() - start
+    if not saved:
+        print(f"{label:<22} save failed")
+        return None
+    start = time.perf_counter()
+    loaded = load_system_state(path)
+    t_load = time.perf_counter() - start
+    same = loaded is not None and answers(loaded) == answers(components)
+    mapped = [lang for lang, index in components['retrieval_system'].mapped_indices.items() if index is not None]
+    print(f"{label:<22} state {pathlib.Path(path).stat().st_size / 1e6:6.2f} MB   save {t_save * 1000:7.1f} ms   "
+          f"load {t_load * 1000:7.1f} ms   mapped {','.join(mapped) or '-':<6} same answers: {same}")
+    return loaded
+
+
+def quiet(function, *args):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return function(*args)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = pathlib.Path(tmp)
+        quiet(initialize_system, tmp / 'snapshots')  # writes the snapshots
+        configs = [('built', quiet(initialize_system, None)),
+                   ('warm start', quiet(initialize_system, tmp / 'snapshots'))]
+        for label, components in configs:
+            round_trip(label, components, tmp / 'state.pkl')
+
+        components = configs[1][1]
+        components['retrieval_system'].add_documents([NEW_DOC])
+        loaded = round_trip('warm start, modified', components, tmp / 'state.pkl')
+        if loaded is not None:
+            # The reloaded system keeps working as a mutable index
+            for system in (components['retrieval_system'], loaded['retrieval_system']):
+                system.add_documents([{**NEW_DOC, 'paragraph_id': 'state_check_en_2'}])
+            print(f"{'':<22} same answers after a further update: {answers(loaded) == answers(components)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Telugu feature modes of RetrievalSystem on the sample corpus: 2-4 character
+n-grams ('char') against 1-2 akshara n-grams within words ('akshara').
+
+Reports index size (distinct features, postings, memory), build time and
+query latency, and retrieval quality on known-item queries: a window of 3-5
+words cut from a paragraph should retrieve that paragraph. Queries come in
+two forms, verbatim and "inflected" (the last akshara of every Telugu word
+of three or more aksharas dropped, standing in for a different case
+suffix). Quality is success@1, success@5 and MRR@5 for the source paragraph,
+plus the share of the top 5 from the source paragraph's kingdom.
+
+Run from the project root:  python benchmarks/bench_te_features.py [num_queries]
+"""
+
+import gc
+import pathlib
+import random
+import sys
+import time
+import tracemalloc
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from nlp.retrieval_system import RetrievalSystem
+from nlp.text_processor import split_aksharas
+from sample_corpus import get_sample_corpus
+
+MODES = ('char', 'akshara')
+
+
+def make_queries(docs, n, seed=0):
+    """(query, source doc) pairs: windows of 3-5 words"""
+    rng = random.Random(seed)
+    queries = []
+    while len(queries) < n:
+        doc = rng.choice(docs)
+        words = doc['text'].split()
+        size = rng.randint(3, 5)
+        if len(words) < size:
+            continue
+        start = rng.randrange(len(words) - size + 1)
+        queries.append((' '.join(words[start:start + size]), doc))
+    return queries
+
+
+def inflect(query):
+    words = []
+    for word in query.split():
+        aksharas = split_aksharas(word)
+        words.append(''.join(aksharas[:-1]) if len(aksharas) >= 3 else word)
+    return ' '.join(words)
+
+
+def quality(system, queries):
+    success1 = success5 = rr = same_kingdom = 0.0
+    for query, source in queries:
+        hits = system.search(query, 'te', top_k=5)['paragraphs']
+        ranks = [i for i, hit in enumerate(hits) if hit['text'] == source['text']]
+        if ranks:
+            success1 += ranks[0] == 0
+            success5 += 1
+            rr += 1 / (ranks[0] + 1)
+        if hits:
+            same_kingdom += sum(hit['kingdom'] == source['kingdom_label'] for hit in hits) / len(hits)
+    n = len(queries)
+    return success1 / n, success5 / n, rr / n, same_kingdom / n
+
+
+def main(num_queries=300):
+    docs = [d for d in get_sample_corpus() if d['language'] == 'te']
+    verbatim = make_queries(docs, num_queries)
+    inflected = [(inflect(q), doc) for q, doc in verbatim]
+
+    for mode in MODES:
+        RetrievalSystem(docs, te_features=mode)  # warm up
+        gc.collect()
+        tracemalloc.start()
+        system = RetrievalSystem(docs, cache_size=0, te_features=mode)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        start = time.perf_counter()
+        system = RetrievalSystem(docs, cache_size=0, te_features=mode)
+        t_build = time.perf_counter() - start
+
+        postings = sum(len(c) for c in system.term_counts['te'] if c)
+        start = time.perf_counter()
+        for query, _ in verbatim:
+            system.search(query, 'te', top_k=5)
+        t_query = (time.perf_counter() - start) / len(verbatim)
+
+        print(f"[{mode}] {len(system.doc_freqs['te'])} features, {postings} postings "
+              f"({postings / len(docs):.0f} terms/paragraph), {memory / 1e6:.1f} MB, "
+              f"build {t_build:.3f}s, {t_query * 1000:.2f} ms/query")
+        for label, queries in (('verbatim', verbatim), ('inflected', inflected)):
+            s1, s5, mrr, kingdom = quality(system, queries)
+            print(f"    {label:<9} success@1 {s1:.3f}  success@5 {s5:.3f}  MRR@5 {mrr:.3f}  "
+                  f"kingdom precision@5 {kingdom:.3f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
@@ -0,0 +1,83 @@
+"""
+Telugu index representations of RetrievalSystem on the sample corpus: plain
+(string-keyed Counters and (doc_id, count) tuple postings) against compact
+(interned term ids, array-backed counts and CSR postings). Reports build
+time, memory held by the index, query latency and the overlap of the top-5
+results on queries cut from the corpus paragraphs.
+
+Run from the project root:  python benchmarks/bench_te_index.py [num_queries]
+"""
+
+import gc
+import pathlib
+import random
+import sys
+import time
+import tracemalloc
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from nlp.retrieval_system import RetrievalSystem
+from sample_corpus import get_sample_corpus
+
+CONFIGS = [
+    ('plain', dict(compact_languages=())),
+    ('compact', dict(compact_languages=('te',))),
+]
+
+
+def make_queries(docs, n, seed=0):
+    """Windows of 1-4 words from random paragraphs"""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(n):
+        words = rng.choice(docs)['text'].split()
+        size = rng.randint(1, 4)
+        start = rng.randrange(max(1, len(words) - size + 1))
+        queries.append(' '.join(words[start:start + size]))
+    return queries
+
+
+def build(docs, kwargs):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    system = RetrievalSystem(docs, cache_size=0, **kwargs)
+    elapsed = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return system, elapsed, memory
+
+
+def main(num_queries=300):
+    docs = [d for d in get_sample_corpus() if d['language'] == 'te']
+    queries = make_queries(docs, num_queries)
+
+    top5 = {}
+    for label, kwargs in CONFIGS:
+        build(docs, kwargs)  # warm up
+        _, _, memory = build(docs, kwargs)  # memory under tracemalloc, timing without
+        start = time.perf_counter()
+        system = RetrievalSystem(docs, cache_size=0, **kwargs)
+        t_build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        top5[label] = [[p['paragraph_id'] for p in system.search(q, 'te', top_k=5)['paragraphs']]
+                       for q in queries]
+        t_query = (time.perf_counter() - start) / len(queries)
+
+        print(f"{label:<8} build {t_build:6.3f}s   index memory {memory / 1e6:7.1f} MB   "
+              f"{t_query * 1000:6.2f} ms/query   {system.get_index_stats()['te']['num_features']} features")
+
+    base = top5[CONFIGS[0][0]]
+    for label, _ in CONFIGS[1:]:
+        overlap = [len(set(a) & set(b)) / len(a) if a else float(not b) for a, b in zip(base, top5[label])]
+        identical = sum(a == b for a, b in zip(base, top5[label]))
+        print(f"top-5 overlap {label} vs {CONFIGS[0][0]}: {sum(overlap) / len(overlap):.3f} "
+              f"(identical rankings {identical}/{len(queries)})")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
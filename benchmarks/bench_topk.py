@@ -0,0 +1,91 @@
+"""
+Top-k selection in RetrievalSystem: the bounded heap used by search against
+the previous collect-and-sort (every candidate above the threshold put in a
+list, the whole list sorted, then sliced). Broad queries such as "dynasty"
+match a large share of the corpus, so the sample corpus is replicated to
+make the candidate lists long. Reports latency per query and the peak memory
+allocated while ranking, and checks that both selections return the same
+ranking.
+
+Run from the project root:  python benchmarks/bench_topk.py [copies]
+"""
+
+import gc
+import pathlib
+import sys
+import time
+import tracemalloc
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from nlp.retrieval_system import RetrievalSystem
+from sample_corpus import get_sample_corpus
+
+QUERIES = {
+    'en': ['dynasty', 'the dynasty', 'empire kingdom', 'king ruled'],
+    'te': ['రాజ్యం', 'సామ్రాజ్యం', 'రాజులు పాలించారు'],
+}
+
+
+def replicate(corpus, copies):
+    docs = []
+    for copy in range(copies):
+        for i, doc in enumerate(corpus):
+            docs.append({**doc, 'paragraph_id': f"{doc.get('paragraph_id', i)}#{copy}"})
+    return docs
+
+
+def legacy_top_k(scored, top_k, min_similarity):
+    """Collect-and-sort, as search ranked before the heap"""
+    ranked = [(doc_id, score) for doc_id, score in scored if score > min_similarity]
+    ranked.sort(key=lambda x: (-round(x[1], 4), x[0]))
+    return ranked[:top_k]
+
+
+def cosine_scores(system, query, language):
+    query_vec = system._vectorize_query(query, language)
+    scores = system._score_postings(query_vec, language, None)
+    query_norm = system._vector_norm(query_vec)
+    doc_norms = system.doc_norms[language]
+    return [(doc_id, dot / (query_norm * doc_norms[doc_id]))
+            for doc_id, dot in scores.items() if doc_norms[doc_id]]
+
+
+def measure(select, candidates, top_k, repeats=20):
+    gc.collect()
+    tracemalloc.start()
+    result = select(iter(candidates), top_k, 0.01)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        select(iter(candidates), top_k, 0.01)
+    return result, (time.perf_counter() - start) / repeats, peak
+
+
+def main(copies=20, top_k=5):
+    docs = replicate(get_sample_corpus(), copies)
+    system = RetrievalSystem(docs, cache_size=0)
+    print(f"{len(docs)} paragraphs ({copies} copies of the sample corpus), top_k={top_k}")
+
+    for language, queries in QUERIES.items():
+        system._ensure_fresh(language)
+        for query in queries:
+            candidates = cosine_scores(system, query, language)
+            legacy, t_legacy, m_legacy = measure(legacy_top_k, candidates, top_k)
+            heap, t_heap, m_heap = measure(system._top_k, candidates, top_k)
+            print(f"[{language}] {query!r:<24} {len(candidates):6d} candidates   "
+                  f"sort {t_legacy * 1000:6.2f} ms {m_legacy / 1024:8.1f} KiB   "
+                  f"heap {t_heap * 1000:6.2f} ms {m_heap / 1024:6.1f} KiB   "
+                  f"same ranking: {legacy == heap}")
+
+        start = time.perf_counter()
+        for query in queries:
+            system.search(query, language, top_k=top_k)
+        print(f"[{language}] search end to end {(time.perf_counter() - start) / len(queries) * 1000:.2f} ms/query")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -89,7 +89,7 @@ def process_query(query, lang_detector, text_processor, spell_corrector,
         tokens = tokens['tokens']
         # Step 3: Spelling Correction
         
-        # This now loads JSON AND builds the n-gram index
+        # Switch to this language's n-gram index (built once, then reused across queries)
         spell_corrector.load_json(detected_lang) 
         
         # 🎯 FIX 4: Correctly parse the dictionary returned by the spell corrector
@@ -134,8 +134,8 @@ def process_query(query, lang_detector, text_processor, spell_corrector,
             expanded_query, detected_lang, detected_kingdoms
         )
             
-        # Add expansion info to results
-        retrieval_result['expansion_info'] = expansion_result
+        # Add expansion info to a copy of the results
+        retrieval_result = {**retrieval_result, 'expansion_info': expansion_result}
             
         # Display results
         display_results(query, lang_result, corrected_query, intent_result, retrieval_result)
@@ -0,0 +1,54 @@
+"""
+Aho-Corasick automaton: finds every occurrence of a fixed set of patterns in
+one left-to-right pass over the text, in O(text length + matches).
+"""
+
+from collections import deque
+
+
+class AhoCorasick:
+    """Multi-pattern matcher over str patterns; pattern ids are list positions"""
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self.goto = [{}]     # state -> {char: next state}
+        self.fail = [0]      # state -> longest proper suffix state
+        self.output = [[]]   # state -> ids of patterns ending here (incl. via fail links)
+
+        for pattern_id, pattern in enumerate(self.patterns):
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                state = nxt
+            self.output[state].append(pattern_id)
+
+        # Breadth-first: a state's fail target is always shallower, so already final
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.output[nxt] = self.output[nxt] + self.output[self.fail[nxt]]
+
+    def finditer(self, text):
+        """Yield (start, end, pattern_id) for every occurrence, end exclusive"""
+        goto, fail, output, patterns = self.goto, self.fail, self.output, self.patterns
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for pattern_id in output[state]:
+                yield i + 1 - len(patterns[pattern_id]), i + 1, pattern_id
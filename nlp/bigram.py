@@ -1,56 +1,214 @@
 import json
-from collections import defaultdict
+import multiprocessing
+import os
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 import math
 
+from nlp.edit_distance import edit_distance
+from nlp.qgram_index import QgramCountIndex
+from nlp.spell_index import load_spell_index
+from nlp.symspell import SymSpellIndex
+from nlp.vocab_trie import VocabularyTrie
+
+
+JSON_FILES = {
+    "te": "telugu_word_count.json",
+    "en": "english_word_counts.json",
+}
+
+# 'ngram': every word sharing an n-gram with the misspelling is scored
+# 'symspell': only words within max_edit_distance, found via deletion neighborhoods
+# 'trie': only words within max_edit_distance, found by a pruned trie traversal
+CANDIDATE_ENGINES = ('ngram', 'symspell', 'trie')
+
 
 class NgramSpellChecker:
-    def __init__(self):
+    # Built indices shared by every checker in the process:
+    # json path -> (file mtime, index state)
+    _shared_indices = {}
+
+    def __init__(self, candidate_engine='ngram', max_edit_distance=2, count_filter=True,
+                 cache_size=1000, workers=0, parallel_threshold=16):
         """
         Initialize the N-gram spell checker.
+
+        candidate_engine: one of CANDIDATE_ENGINES; scoring is the same for all.
+        max_edit_distance: candidate radius of the 'symspell' and 'trie' engines, and the edit
+            threshold of the 'ngram' engine's count filter.
+        count_filter: with the 'ngram' engine, score only words within max_edit_distance:
+            words sharing too few n-grams (or differing too much in length) are dropped
+            unseen, the rest are checked with a bounded edit distance.
+        cache_size: number of get_confident_words results kept in the LRU memo.
+        workers: size of the process pool get_confident_words_tokens may use; 0 or 1
+            keeps correction in-process.
+        parallel_threshold: fewest tokens needing scoring for a query to be fanned out.
         """
-        
+        if candidate_engine not in CANDIDATE_ENGINES:
+            raise ValueError(f"candidate_engine must be one of {CANDIDATE_ENGINES}")
+        self.candidate_engine = candidate_engine
+        self.max_edit_distance = max_edit_distance
+        self.count_filter = count_filter
+
         self.unigram_map = defaultdict(set)
         self.bigram_map = defaultdict(set)
         self.trigram_map = defaultdict(set)
         self.word_counts = {}
         self.max_word_count = 0  # For frequency normalization
+        self.language = None  # language whose index is currently active
+        self._active_state = self._empty_state()
+
+        # LRU memo of get_confident_words: (language, token, top_k) -> result
+        self.cache_size = cache_size
+        self.correction_cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache_states = {}  # language -> build of the index the memoized results came from
+
+        self.workers = workers
+        self.parallel_threshold = parallel_threshold
+        self._pool = None  # created on the first parallel query
 
     def load_json(self, language):
-        """Load the JSON file with words and their counts."""
-        if language == "te":
-            json_file = "telugu_word_count.json"
-        elif language == "en":
-            json_file = "english_word_counts.json"
-        else:
+        """
+        Make the index for `language` active. The index is loaded only the first time
+        a language is used (or when its file changes) -- memory-mapped from a prebuilt
+        .spellidx artifact if one is current, else built from the JSON; afterwards
+        this is a no-op when the language is already resident.
+        """
+        json_file = JSON_FILES.get(language)
+        if json_file is None:
             print(f"Warning: No JSON file for language '{language}'. Spell checker will be inactive.")
-            self.word_counts = {}
-            self.max_word_count = 0
+            self._activate(language, self._empty_state())
             return # Stop here
 
         try:
-            with open(json_file, "r", encoding="utf-8") as f:
-                self.word_counts = json.load(f)
-        except FileNotFoundError:
+            mtime = os.path.getmtime(json_file)
+        except OSError:
             print(f"Error: Could not find {json_file}. Spell checker will be inactive.")
-            self.word_counts = {}
-            self.max_word_count = 0
+            self._activate(language, self._empty_state())
             return
 
-        # 🎯 FIX 1: Calculate max_word_count for normalization
-        if self.word_counts:
-            self.max_word_count = max(self.word_counts.values())
-        else:
-            self.max_word_count = 0
+        cached = self._shared_indices.get(json_file)
+        if cached is not None and cached[0] == mtime:
+            if self.language != language or self.word_counts is not cached[1]['word_counts']:
+                self._activate(language, cached[1])
+            return
 
+        # Prefer the prebuilt, memory-mapped index (python nlp/spell_index.py build)
+        prebuilt = load_spell_index(json_file)
+        if prebuilt is not None:
+            self._activate(language, self._prebuilt_state(prebuilt))
+            self._shared_indices[json_file] = (mtime, self._active_state)
+            return
+
+        with open(json_file, "r", encoding="utf-8") as f:
+            word_counts = json.load(f)
+
+        # Build into fresh maps so checkers sharing an older index are unaffected
+        self._activate(language, self._empty_state())
+        self.word_counts = word_counts
+        # 🎯 FIX 1: Calculate max_word_count for normalization
+        self.max_word_count = max(word_counts.values()) if word_counts else 0
         # 🎯 FIX 2: Build the index after loading words
-        # Clear old indices first in case this is called multiple times
-        self.unigram_map.clear()
-        self.bigram_map.clear()
-        self.trigram_map.clear()
-        
-        # This function was never being called before!
         self.build_index()
 
+        self._active_state = self._state()
+        self._shared_indices[json_file] = (mtime, self._active_state)
+
+    def use_spell_index(self, language, index):
+        """
+        Make a mapped index (nlp.spell_index.MappedSpellIndex) the resident index for
+        `language`, as if load_json had loaded it. For callers that keep and validate
+        their own .spellidx artifacts, e.g. the warm-start snapshots of initialize_system.
+        """
+        json_file = JSON_FILES[language]
+        self._activate(language, self._prebuilt_state(index))
+        self._shared_indices[json_file] = (os.path.getmtime(json_file), self._active_state)
+
+    @staticmethod
+    def _prebuilt_state(index):
+        return {
+            'build': object(),  # identifies this load / build of the index
+            'word_counts': index.word_counts,
+            'max_word_count': index.max_word_count,
+            'unigram_map': index.ngram_maps[1],
+            'bigram_map': index.ngram_maps[2],
+            'trigram_map': index.ngram_maps[3],
+            'derived': {},
+        }
+
+    def _empty_state(self):
+        return {
+            'build': object(),  # identifies this load / build of the index
+            'word_counts': {},
+            'max_word_count': 0,
+            'unigram_map': defaultdict(set),
+            'bigram_map': defaultdict(set),
+            'trigram_map': defaultdict(set),
+            'derived': {},  # candidate indexes built on first use, see _derived_index
+        }
+
+    def _state(self):
+        # The maps built into the active (empty) state: same build
+        return {
+            'build': self._active_state['build'],
+            'word_counts': self.word_counts,
+            'max_word_count': self.max_word_count,
+            'unigram_map': self.unigram_map,
+            'bigram_map': self.bigram_map,
+            'trigram_map': self.trigram_map,
+            'derived': self._active_state['derived'],
+        }
+
+    def _activate(self, language, state):
+        self.language = language
+        self.word_counts = state['word_counts']
+        self.max_word_count = state['max_word_count']
+        self.unigram_map = state['unigram_map']
+        self.bigram_map = state['bigram_map']
+        self.trigram_map = state['trigram_map']
+        self._active_state = state
+
+        # A different index for this language means the vocabulary was reloaded
+        if self._cache_states.get(language, state['build']) is not state['build']:
+            self._invalidate_cache(language)
+        self._cache_states[language] = state['build']
+
+    # ===== Correction memo =====
+
+    def _get_from_cache(self, key):
+        if key in self.correction_cache:
+            self.cache_hits += 1
+            self.correction_cache.move_to_end(key)
+            return self.correction_cache[key]
+        self.cache_misses += 1
+        return None
+
+    def _add_to_cache(self, key, result):
+        self.correction_cache[key] = result
+        self.correction_cache.move_to_end(key)
+        if len(self.correction_cache) > self.cache_size:
+            self.correction_cache.popitem(last=False)
+
+    def _invalidate_cache(self, language=None):
+        if language is None:
+            self.correction_cache.clear()
+            return
+        for key in [k for k in self.correction_cache if k[0] == language]:
+            del self.correction_cache[key]
+
+    def get_cache_stats(self):
+        total = self.cache_hits + self.cache_misses
+        hit_rate = (self.cache_hits / total * 100) if total else 0
+        return {
+            'cache_size': len(self.correction_cache),
+            'max_cache_size': self.cache_size,
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'hit_rate': hit_rate
+        }
+
     def generate_ngrams(self, word, n):
         """Generate n-grams for a given word."""
         return [word[i:i+n] for i in range(len(word) - n + 1)]
@@ -69,16 +227,51 @@ class NgramSpellChecker:
                         self.trigram_map[ngram].add(word)
 
     def get_candidates(self, error_word, n=2):
-        """Return set of candidate words that share at least one n-gram with the error word."""
+        """
+        Return set of candidate words for the error word: those sharing at least one
+        n-gram with it (with count_filter, only those within max_edit_distance), or
+        with the 'symspell' / 'trie' engines those within max_edit_distance.
+        """
         ngram_map = {1: self.unigram_map, 2: self.bigram_map, 3: self.trigram_map}.get(n)
         if ngram_map is None:
             raise ValueError("n must be 1, 2, or 3")
 
+        if self.candidate_engine == 'symspell':
+            return self.get_symspell_index().lookup(error_word)
+        if self.candidate_engine == 'trie':
+            matches = self.get_vocabulary_trie().lookup(error_word, self.max_edit_distance)
+            return {word for word, _, _ in matches}
+        if self.count_filter:
+            return self.get_qgram_index().candidates(error_word, n, self.max_edit_distance)
+
         candidates = set()
         for ngram in self.generate_ngrams(error_word, n):
             candidates.update(ngram_map.get(ngram, set()))
         return candidates
 
+    def _derived_index(self, key, build):
+        """Candidate index of the active language, built on first use and shared like the n-gram maps"""
+        derived = self._active_state['derived']
+        if key not in derived:
+            derived[key] = build()
+        return derived[key]
+
+    def get_symspell_index(self):
+        """Deletion-neighborhood index of the active language"""
+        def build():
+            print(f"Building SymSpell index for {len(self.word_counts)} words...")
+            return SymSpellIndex(self.word_counts, self._levenshtein,
+                                 max_distance=self.max_edit_distance)
+        return self._derived_index(('symspell', self.max_edit_distance), build)
+
+    def get_vocabulary_trie(self):
+        """Frequency trie over the active language's vocabulary"""
+        return self._derived_index('trie', lambda: VocabularyTrie(self.word_counts))
+
+    def get_qgram_index(self):
+        """Length-bucketed n-gram index of the active language"""
+        return self._derived_index('qgram', lambda: QgramCountIndex(self.word_counts, self._levenshtein))
+
     def jaccard_similarity(self, word1, word2, n=2):
         """Compute Jaccard similarity between two words based on n-grams."""
         ngrams1 = set(self.generate_ngrams(word1, n))
@@ -87,25 +280,9 @@ class NgramSpellChecker:
         union = ngrams1 | ngrams2
         return len(intersection) / len(union) if union else 0
 
-    # ✅ Replaced library call with this in-built version
     def _levenshtein(self, a: str, b: str, max_dist: int = 2) -> int:
-        """Compute Levenshtein edit distance between two strings (optimized)."""
-        if a == b:
-            return 0
-        if abs(len(a) - len(b)) > max_dist:
-            return max_dist + 1
-        prev = list(range(len(b) + 1))
-        for i, ca in enumerate(a, start=1):
-            cur = [i]
-            best = cur[0]
-            for j, cb in enumerate(b, start=1):
-                cost = 0 if ca == cb else 1
-                cur.append(min(prev[j] + 1, cur[j-1] + 1, prev[j-1] + cost))
-                best = min(best, cur[-1])
-            if best > max_dist:
-                return max_dist + 1
-            prev = cur
-        return prev[-1]
+        """Levenshtein distance, exact up to max_dist and max_dist + 1 beyond (bit-parallel)."""
+        return edit_distance(a, b, max_dist)
 
     def get_top_candidates(self, error_word, n=2, top_k=3):
         """
@@ -145,7 +322,23 @@ class NgramSpellChecker:
         return scored[:top_k]
 
     def get_confident_words(self, error_word, top_k=3):
-        """Intersection of top uni-, bi-, and tri-gram candidates."""
+        """
+        Intersection of top uni-, bi-, and tri-gram candidates. In-vocabulary words
+        are returned as-is; other results are memoized per (language, token, top_k).
+        """
+        if error_word in self.word_counts:
+            return [(error_word, 1.0)]
+
+        key = (self.language, error_word, top_k)
+        cached = self._get_from_cache(key)
+        if cached is not None:
+            return list(cached)
+
+        result = self._confident_words(error_word, top_k)
+        self._add_to_cache(key, tuple(result))
+        return result
+
+    def _confident_words(self, error_word, top_k):
         top_uni = self.get_top_candidates(error_word, n=1, top_k=top_k)
         top_bi = self.get_top_candidates(error_word, n=2, top_k=top_k)
         top_tri = self.get_top_candidates(error_word, n=3, top_k=top_k)
@@ -175,13 +368,86 @@ class NgramSpellChecker:
         return result
     
     def get_confident_words_tokens(self, error_tokens, top_k=3):
-        """Get confident words for a list of error tokens."""
+        """
+        Get confident words for a list of error tokens. When workers > 1 and at least
+        parallel_threshold distinct tokens need scoring (not in vocabulary, not
+        memoized), they are scored in the process pool.
+        """
+        parallel = {}
+        if self.workers > 1:
+            pending = [token for token in dict.fromkeys(error_tokens)
+                       if token not in self.word_counts
+                       and (self.language, token, top_k) not in self.correction_cache]
+            if len(pending) >= self.parallel_threshold:
+                parallel = self._correct_parallel(pending, top_k)
+
         all_confident = {}
         for token in error_tokens:
-            confident_words = self.get_confident_words(token, top_k=top_k)
-            all_confident[token] = confident_words
+            if token in parallel:
+                all_confident[token] = list(parallel[token])
+            else:
+                all_confident[token] = self.get_confident_words(token, top_k=top_k)
         return all_confident
 
+    def _get_pool(self):
+        if self._pool is None:
+            try:
+                # Forked workers inherit the already-built indexes
+                context = multiprocessing.get_context('fork')
+            except ValueError:
+                context = None  # no fork: workers load the prebuilt index or the JSON
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        return self._pool
+
+    def _correct_parallel(self, tokens, top_k):
+        """Score tokens across the process pool; returns token -> result, or {} on pool failure"""
+        config = (self.candidate_engine, self.max_edit_distance, self.count_filter)
+        chunks = [tokens[i::self.workers] for i in range(self.workers)]
+        chunks = [chunk for chunk in chunks if chunk]
+        try:
+            pool = self._get_pool()
+            futures = [pool.submit(_correct_in_worker, config, self.language, chunk, top_k)
+                       for chunk in chunks]
+            chunk_results = [future.result() for future in futures]
+        except Exception as e:
+            print(f"Parallel spell correction failed ({e}); correcting in-process")
+            self.close()
+            return {}
+
+        results = {}
+        for chunk, chunk_result in zip(chunks, chunk_results):
+            for token, result in zip(chunk, chunk_result):
+                self.cache_misses += 1
+                self._add_to_cache((self.language, token, top_k), tuple(result))
+                results[token] = result
+        return results
+
+    def close(self):
+        """Shut down the process pool, if one was started"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __getstate__(self):
+        # The process pool belongs to this process; an unpickled checker starts its own
+        state = self.__dict__.copy()
+        state['_pool'] = None
+        return state
+
+
+# Checkers used inside pool workers, one per checker configuration
+_worker_checkers = {}
+
+
+def _correct_in_worker(config, language, tokens, top_k):
+    checker = _worker_checkers.get(config)
+    if checker is None:
+        engine, max_edit_distance, count_filter = config
+        checker = _worker_checkers[config] = NgramSpellChecker(
+            engine, max_edit_distance, count_filter, cache_size=0)
+    checker.load_json(language)
+    return [checker._confident_words(token, top_k) for token in tokens]
+
 
 # # ================= Example usage =================
 # if __name__ == "__main__":
@@ -0,0 +1,212 @@
+"""
+Compact in-memory representation of a language's index for RetrievalSystem.
+
+Character n-gram features produce hundreds of distinct terms per paragraph,
+and the plain representation stores each as a separate string key in a
+per-document Counter plus a (doc_id, count) tuple in a postings list. Here
+every distinct term is interned once in a FeatureTable and given a dense
+integer id, so that:
+
+    TermCounts     a document's {term: count} as two parallel u32 arrays
+    CompactShard   one kingdom's postings as CSR arrays (sorted term ids,
+                   offsets, interleaved doc id / count pairs), built in bulk
+                   from the forward index; documents added or removed later
+                   go to a small delta that is merged into new arrays once it
+                   outgrows MERGE_FRACTION of the shard
+
+Both expose the same mapping interface (string terms) as the dicts they
+replace, so ranking, saving and the sparse backend are unchanged.
+"""
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+from itertools import accumulate, chain
+from operator import mul
+
+
+class FeatureTable:
+    """Global term -> dense integer id intern table"""
+
+    def __init__(self):
+        self.ids = {}
+        self.terms = []
+
+    def __len__(self):
+        return len(self.terms)
+
+    def intern(self, terms):
+        """Ids of `terms`, adding unseen ones. Returns an array('I')."""
+        new = set(terms).difference(self.ids)
+        if new:
+            start = len(self.terms)
+            self.ids.update(zip(new, range(start, start + len(new))))
+            self.terms.extend(new)
+        return array('I', map(self.ids.__getitem__, terms))
+
+    def counts(self, counter):
+        """A TermCounts holding the same {term: count} as counter, in the same order"""
+        return TermCounts(self, self.intern(counter.keys()), array('I', counter.values()))
+
+
+class TermCounts(Mapping):
+    """
+    Read-only {term: count} of one document over a FeatureTable. Iteration order
+    is the order the counts were built in; items() returns an iterator.
+    """
+
+    __slots__ = ('table', 'ids', 'counts')
+
+    def __init__(self, table, ids, counts):
+        self.table = table
+        self.ids = ids
+        self.counts = counts
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        return map(self.table.terms.__getitem__, self.ids)
+
+    def __getitem__(self, term):
+        term_id = self.table.ids.get(term)
+        try:
+            return self.counts[self.ids.index(term_id)]
+        except (TypeError, ValueError):
+            raise KeyError(term) from None
+
+    def values(self):
+        return self.counts
+
+    def items(self):
+        return zip(iter(self), self.counts)
+
+    def norm_sums(self, logs):
+        """(sum(c²), sum(c² * l), sum(c² * l²)) over the counts c, l = logs[term_id]"""
+        squares = list(map(mul, self.counts, self.counts))
+        weighted = list(map(mul, squares, map(logs.__getitem__, self.ids)))
+        return float(sum(squares)), sum(weighted), sum(map(mul, weighted, map(logs.__getitem__, self.ids)))
+
+
+class CompactShard:
+    """
+    One kingdom's postings; get(term) yields (doc_id, count) pairs like the dict shards.
+    The CSR arrays are never modified: add() puts a document's postings in the delta
+    and remove() hides an array document (or drops a delta one), until the owner
+    replaces the shard with a merged one (see needs_merge).
+    """
+
+    __slots__ = ('table', 'term_ids', 'offsets', 'postings', 'added', 'added_docs', 'removed', 'pending')
+
+    # Merge once the postings added or removed exceed this share of the arrays' postings
+    MERGE_FRACTION = 0.25
+
+    def __init__(self, table, term_ids, offsets, postings):
+        self.table = table
+        self.term_ids = term_ids  # sorted ids of the terms present in the shard
+        self.offsets = offsets    # term_ids[i]'s postings are postings[offsets[i]:offsets[i+1]]
+        self.postings = postings  # doc id, count, doc id, count, ...
+        self.added = {}           # term id -> [doc id, count, ...] of documents added since
+        self.added_docs = set()
+        self.removed = set()      # documents of the arrays removed since
+        self.pending = 0          # postings added or removed since the arrays were built
+
+    @classmethod
+    def empty(cls, table):
+        return cls(table, array('I'), array('I', [0]), array('I'))
+
+    def get(self, term, default=None):
+        term_id = self.table.ids.get(term)
+        if term_id is None:
+            return default
+        found = None
+        i = bisect_left(self.term_ids, term_id)
+        if i < len(self.term_ids) and self.term_ids[i] == term_id:
+            pairs = iter(self.postings[self.offsets[i]:self.offsets[i + 1]])
+            found = zip(pairs, pairs)
+            if self.removed:
+                removed = self.removed
+                found = ((doc_id, count) for doc_id, count in found if doc_id not in removed)
+        extra = self.added.get(term_id)
+        if extra:
+            pairs = iter(extra)
+            return zip(pairs, pairs) if found is None else chain(found, zip(pairs, pairs))
+        return default if found is None else found
+
+    def add(self, doc_id, counts):
+        """Index a document's TermCounts in the delta"""
+        added = self.added
+        for term_id, count in zip(counts.ids, counts.counts):
+            cell = added.get(term_id)
+            if cell is None:
+                added[term_id] = [doc_id, count]
+            else:
+                cell += (doc_id, count)
+        self.added_docs.add(doc_id)
+        self.pending += len(counts)
+
+    def remove(self, doc_id, counts):
+        """Unindex a document; counts are the TermCounts it was added with"""
+        if doc_id in self.added_docs:
+            self.added_docs.discard(doc_id)
+            for term_id in counts.ids:
+                cell = self.added[term_id]
+                for i in range(0, len(cell), 2):
+                    if cell[i] == doc_id:
+                        del cell[i:i + 2]
+                        break
+                if not cell:
+                    del self.added[term_id]
+        else:
+            self.removed.add(doc_id)
+        self.pending += len(counts)
+
+    def needs_merge(self):
+        return self.pending > self.MERGE_FRACTION * (len(self.postings) // 2)
+
+    def __len__(self):
+        return len(self.term_ids)
+
+    def memory_bytes(self):
+        """Bytes of the arrays, plus an estimate for the delta"""
+        arrays = sum(a.itemsize * len(a) for a in (self.term_ids, self.offsets, self.postings))
+        return arrays + 8 * sum(len(cell) for cell in self.added.values())
+
+
+def _bucket(cells, doc_id, counts):
+    """Append a document's postings to cells (term id -> [doc id, count, ...])"""
+    get = cells.get
+    for term_id, count in zip(counts.ids, counts.counts):
+        cell = get(term_id)
+        if cell is None:
+            cells[term_id] = [doc_id, count]
+        else:
+            cell += (doc_id, count)
+
+
+def _shard_from_cells(table, cells):
+    present = array('I', sorted(cells))
+    lists = list(map(cells.__getitem__, present))
+    return CompactShard(table, present,
+                        array('I', accumulate(map(len, lists), initial=0)),
+                        array('I', chain.from_iterable(lists)))
+
+
+def build_compact_postings(table, term_counts, doc_kingdoms):
+    """
+    kingdom -> CompactShard from a forward index of TermCounts (None for deleted
+    documents). Within a term, postings are in ascending doc id order.
+    """
+    cells = {}  # kingdom -> term id -> [doc id, count, doc id, count, ...]
+    for doc_id, counts in enumerate(term_counts):
+        if counts:
+            _bucket(cells.setdefault(doc_kingdoms[doc_id], {}), doc_id, counts)
+    return {kingdom: _shard_from_cells(table, shard) for kingdom, shard in cells.items()}
+
+
+def build_compact_shard(table, term_counts, doc_ids):
+    """CompactShard of the documents doc_ids (ascending) of a forward index of TermCounts"""
+    cells = {}
+    for doc_id in doc_ids:
+        _bucket(cells, doc_id, term_counts[doc_id])
+    return _shard_from_cells(table, cells)
@@ -0,0 +1,72 @@
+"""
+Bit-parallel Levenshtein distance (Myers 1999, in Hyyro's formulation for
+global edit distance), using Python ints as bit-vectors of any length.
+
+One string is encoded as per-symbol match masks; the DP column for each
+symbol of the other string is then updated with a handful of integer
+operations instead of an inner Python loop, so the cost is O(len(b)) big-int
+steps rather than O(len(a) * len(b)) list operations.
+
+Works on any sequences of hashable symbols: str (code points) or a list of
+grapheme clusters such as nlp.text_processor.split_aksharas(word).
+"""
+
+from nlp.text_processor import split_aksharas
+
+
+def edit_distance(a, b, max_dist=None, graphemes=False):
+    """
+    Levenshtein distance between a and b.
+
+    With max_dist, the exact distance is returned when it is <= max_dist and
+    max_dist + 1 otherwise; the scan stops as soon as the bound is certain to
+    be exceeded. graphemes=True compares Telugu aksharas instead of code points.
+    """
+    if graphemes:
+        a, b = split_aksharas(a), split_aksharas(b)
+    if a == b:
+        return 0
+
+    m, n = len(a), len(b)
+    if max_dist is None:
+        max_dist = max(m, n)
+    elif abs(m - n) > max_dist:
+        return max_dist + 1
+    if m == 0 or n == 0:
+        return min(m + n, max_dist + 1)
+
+    # Match mask per symbol of a: bit i is set where a[i] == symbol
+    peq = {}
+    bit = 1
+    for symbol in a:
+        peq[symbol] = peq.get(symbol, 0) | bit
+        bit <<= 1
+    mask = bit - 1
+    last = 1 << (m - 1)
+
+    pv = mask   # vertical +1 deltas of the current column
+    mv = 0      # vertical -1 deltas
+    score = m   # D[m][j]
+    remaining = n
+    for symbol in b:
+        eq = peq.get(symbol, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        # Row 0 of the global DP grows by one per column: shift in a +1
+        ph = (ph << 1) | 1
+        mh <<= 1
+        pv = (mh | ~(xv | ph)) & mask
+        mv = ph & xv
+
+        remaining -= 1
+        # Each remaining column can lower the score by at most one
+        if score - remaining > max_dist:
+            return max_dist + 1
+
+    return score if score <= max_dist else max_dist + 1
@@ -0,0 +1,398 @@
+"""
+Versioned binary on-disk format for RetrievalSystem, opened with mmap and
+queried in place, so several worker processes share the index pages through
+the OS page cache instead of each unpickling its own copy.
+
+Layout (all integers little-endian, every section 8-byte aligned):
+
+    MAGIC (8 bytes) | version u32 | header length u32 | header JSON | sections...
+
+The JSON header records the Telugu feature mode the terms were produced with
+and lists, per language, the document/term counts and the kingdom names, plus
+the (offset, byte length, typecode) of each "<lang>/<name>" section:
+
+    term_blob / term_offsets      sorted UTF-8 term dictionary
+    doc_freqs                     document frequency per term
+    posting_offsets               (term, kingdom) cell -> range in the postings
+    posting_docs / posting_counts postings, grouped by term then kingdom
+    doc_norms                     L2 norm of each document's count * idf vector
+    doc_lengths / doc_kingdoms    token count and kingdom index per document
+    text_blob / text_offsets      paragraph texts
+    pid_blob / pid_offsets        JSON-encoded paragraph ids
+
+Usage:
+    python nlp/index_store.py convert old_index.pkl new_index.idx
+"""
+
+import argparse
+import json
+import math
+import mmap
+import os
+import pathlib
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+
+MAGIC = b'WKIDX\x00\r\n'
+FORMAT_VERSION = 1
+ALIGNMENT = 8
+LANGUAGES = ('en', 'te')
+
+
+def is_index_file(filepath, magic=MAGIC):
+    """True if filepath starts with the binary index magic bytes"""
+    try:
+        with open(filepath, 'rb') as f:
+            return f.read(len(magic)) == magic
+    except OSError:
+        return False
+
+
+# ---------------------------------------------------------
+#  Sectioned file container (shared with nlp/spell_index.py)
+# ---------------------------------------------------------
+def write_sections(filepath, magic, version, header, sections):
+    """
+    Write magic | version | header JSON | aligned sections. `sections` maps a name to
+    (payload bytes, array typecode); their placement is recorded in header['sections'].
+    The file is written to a temp path and renamed, so readers never see a partial file.
+    """
+    if sys.byteorder != 'little':
+        raise RuntimeError("The binary index format is little-endian only")
+
+    header = dict(header, sections={name: [None, len(payload), typecode]
+                                    for name, (payload, typecode) in sections.items()})
+    # Offsets depend on the header length, which depends on the offsets; iterate to a fixpoint
+    header_len = 0
+    while True:
+        offset = _align(len(magic) + 8 + header_len)
+        for name, (payload, _) in sections.items():
+            header['sections'][name][0] = offset
+            offset = _align(offset + len(payload))
+        header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+        if len(header_bytes) == header_len:
+            break
+        header_len = len(header_bytes)
+
+    tmp_path = f"{filepath}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(magic)
+        f.write(struct.pack('<II', version, header_len))
+        f.write(header_bytes)
+        for name, (payload, _) in sections.items():
+            f.write(b'\x00' * (header['sections'][name][0] - f.tell()))
+            f.write(payload)
+    os.replace(tmp_path, filepath)
+
+
+def map_sections(filepath, magic, version):
+    """
+    mmap a file written by write_sections. Returns (header, {name: typed memoryview});
+    the views read straight from the shared page cache.
+    """
+    if sys.byteorder != 'little':
+        raise RuntimeError("The binary index format is little-endian only")
+    with open(filepath, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if mapped[:len(magic)] != magic:
+        raise ValueError(f"{filepath} does not start with the expected magic bytes")
+    file_version, header_len = struct.unpack_from('<II', mapped, len(magic))
+    if file_version != version:
+        raise ValueError(f"Unsupported format version {file_version} in {filepath} (expected {version})")
+    start = len(magic) + 8
+    header = json.loads(mapped[start:start + header_len].decode('utf-8'))
+
+    view = memoryview(mapped)
+    arrays = {name: view[offset:offset + length].cast(typecode)
+              for name, (offset, length, typecode) in header['sections'].items()}
+    return header, arrays
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def pack_strings(strings):
+    """Encode strings as (UTF-8 blob section, u64 offsets section) for write_sections"""
+    blob = bytearray()
+    offsets = array('Q', [0])
+    for string in strings:
+        blob += string.encode('utf-8')
+        offsets.append(len(blob))
+    return (bytes(blob), 'B'), (offsets.tobytes(), 'Q')
+
+
+class MappedStrings:
+    """Read-only string table over a mapped blob + offsets pair"""
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def raw(self, i):
+        return bytes(self.blob[self.offsets[i]:self.offsets[i + 1]])
+
+    def __getitem__(self, i):
+        return self.raw(i).decode('utf-8')
+
+    def find(self, string):
+        """Binary search a table sorted by UTF-8 bytes; returns the index or None"""
+        key = string.encode('utf-8')
+        n = len(self)
+        lo = bisect_left(range(n), key, key=self.raw)
+        if lo < n and self.raw(lo) == key:
+            return lo
+        return None
+
+
+# ---------------------------------------------------------
+#  Writing
+# ---------------------------------------------------------
+def _language_sections(rs, language):
+    """Serialize the live documents of one language; doc ids are compacted in order"""
+    live = [doc_id for doc_id, doc in enumerate(rs.paragraph_metadata[language]) if doc is not None]
+    metadata = rs.paragraph_metadata[language]
+    term_counts = rs.term_counts[language]
+    df = rs.doc_freqs[language]
+
+    kingdoms = sorted({metadata[d]['kingdom_label'] for d in live})
+    kingdom_index = {k: i for i, k in enumerate(kingdoms)}
+    num_kingdoms = len(kingdoms)
+
+    terms = sorted(df, key=lambda t: t.encode('utf-8'))
+    term_ids = {t: i for i, t in enumerate(terms)}
+    num_docs = len(live)
+    idf = {t: math.log((1 + num_docs) / (1 + df[t])) + 1 for t in terms}
+
+    # Bucket postings by (term, kingdom) cell, doc ids ascending
+    cells = [[] for _ in range(len(terms) * num_kingdoms)]
+    doc_norms = array('d')
+    doc_lengths = array('I')
+    doc_kingdoms = array('H')
+    texts = []
+    pids = []
+    for new_id, doc_id in enumerate(live):
+        doc = metadata[doc_id]
+        counts = term_counts[doc_id]
+        k = kingdom_index[doc['kingdom_label']]
+        for term, count in counts.items():
+            cells[term_ids[term] * num_kingdoms + k].append((new_id, count))
+        doc_norms.append(math.sqrt(sum((c * idf[t]) ** 2 for t, c in counts.items())))
+        doc_lengths.append(rs.doc_lengths[language][doc_id])
+        doc_kingdoms.append(k)
+        texts.append(doc['text'])
+        pids.append(json.dumps(doc.get('paragraph_id', new_id), ensure_ascii=False))
+
+    posting_offsets = array('Q', [0])
+    posting_docs = array('I')
+    posting_counts = array('I')
+    for cell in cells:
+        for doc_id, count in cell:
+            posting_docs.append(doc_id)
+            posting_counts.append(count)
+        posting_offsets.append(len(posting_docs))
+
+    term_blob, term_offsets = pack_strings(terms)
+    text_blob, text_offsets = pack_strings(texts)
+    pid_blob, pid_offsets = pack_strings(pids)
+    sections = {
+        'term_blob': term_blob,
+        'term_offsets': term_offsets,
+        'doc_freqs': (array('I', (df[t] for t in terms)).tobytes(), 'I'),
+        'posting_offsets': (posting_offsets.tobytes(), 'Q'),
+        'posting_docs': (posting_docs.tobytes(), 'I'),
+        'posting_counts': (posting_counts.tobytes(), 'I'),
+        'doc_norms': (doc_norms.tobytes(), 'd'),
+        'doc_lengths': (doc_lengths.tobytes(), 'I'),
+        'doc_kingdoms': (doc_kingdoms.tobytes(), 'H'),
+        'text_blob': text_blob,
+        'text_offsets': text_offsets,
+        'pid_blob': pid_blob,
+        'pid_offsets': pid_offsets,
+    }
+    kingdom_counts = [0] * num_kingdoms
+    for k in doc_kingdoms:
+        kingdom_counts[k] += 1
+    info = {
+        'num_docs': num_docs,
+        'num_terms': len(terms),
+        'kingdoms': kingdoms,
+        'kingdom_counts': kingdom_counts,
+    }
+    return info, sections
+
+
+def write_index(rs, filepath):
+    """Write a RetrievalSystem's in-memory index to filepath in the binary format"""
+    header = {'languages': {}, 'te_features': rs.te_features}
+    sections = {}
+    for language in LANGUAGES:
+        info, lang_sections = _language_sections(rs, language)
+        header['languages'][language] = info
+        for name, section in lang_sections.items():
+            sections[f"{language}/{name}"] = section
+    write_sections(filepath, MAGIC, FORMAT_VERSION, header, sections)
+
+
+# ---------------------------------------------------------
+#  Reading (in place, via mmap)
+# ---------------------------------------------------------
+class MappedIndexFile:
+    """An open binary index; exposes one MappedLanguageIndex per language"""
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        header, arrays = map_sections(filepath, MAGIC, FORMAT_VERSION)
+        self.te_features = header.get('te_features', 'char')
+        self.languages = {}
+        for language, info in header['languages'].items():
+            prefix = f"{language}/"
+            sections = {name[len(prefix):]: view for name, view in arrays.items() if name.startswith(prefix)}
+            self.languages[language] = MappedLanguageIndex(language, info, sections)
+
+
+class MappedLanguageIndex:
+    """Read-only, in-place view of one language's index"""
+
+    def __init__(self, language, info, sections):
+        self.language = language
+        self.num_docs = info['num_docs']
+        self.num_terms = info['num_terms']
+        self.kingdoms = info['kingdoms']
+        self.kingdom_counts = dict(zip(self.kingdoms, info['kingdom_counts']))
+
+        for name, view in sections.items():
+            setattr(self, name, view)
+
+        self.terms = MappedStrings(self.term_blob, self.term_offsets)
+        self.texts = MappedStrings(self.text_blob, self.text_offsets)
+        self.paragraph_ids = MappedStrings(self.pid_blob, self.pid_offsets)
+        self.term_id = lru_cache(maxsize=65536)(self.terms.find)
+        self.idf = MappedIdf(self)
+        self.shards = {k: MappedShard(self, i) for i, k in enumerate(self.kingdoms)}
+        self.documents = MappedDocuments(self)
+
+    def postings(self, term_id, kingdom_index):
+        cell = term_id * len(self.kingdoms) + kingdom_index
+        start, end = self.posting_offsets[cell], self.posting_offsets[cell + 1]
+        return self.posting_docs[start:end], self.posting_counts[start:end]
+
+    def term_counts(self):
+        """Rebuild the per-document {term: count} forward index (used to materialize)"""
+        counts = [{} for _ in range(self.num_docs)]
+        for term_id in range(self.num_terms):
+            term = self.terms[term_id]
+            for k in range(len(self.kingdoms)):
+                docs, cnts = self.postings(term_id, k)
+                for doc_id, count in zip(docs, cnts):
+                    counts[doc_id][term] = count
+        return counts
+
+
+class MappedShard:
+    """One kingdom's postings; get(term) yields (doc_id, count) pairs like the dict shards"""
+
+    def __init__(self, index, kingdom_index):
+        self.index = index
+        self.kingdom_index = kingdom_index
+
+    def get(self, term, default=None):
+        term_id = self.index.term_id(term)
+        if term_id is None:
+            return default
+        docs, counts = self.index.postings(term_id, self.kingdom_index)
+        if not len(docs):
+            return default
+        return zip(docs, counts)
+
+
+class MappedIdf:
+    """Mapping-like term -> idf, computed from the stored document frequencies"""
+
+    def __init__(self, index):
+        self.index = index
+
+    def get(self, term, default=None):
+        term_id = self.index.term_id(term)
+        if term_id is None:
+            return default
+        return math.log((1 + self.index.num_docs) / (1 + self.index.doc_freqs[term_id])) + 1
+
+    def __getitem__(self, term):
+        value = self.get(term)
+        if value is None:
+            raise KeyError(term)
+        return value
+
+    def __len__(self):
+        return self.index.num_terms
+
+
+class MappedDocuments:
+    """Sequence of paragraph dicts decoded on access from the text blob"""
+
+    def __init__(self, index):
+        self.index = index
+
+    def __len__(self):
+        return self.index.num_docs
+
+    def __getitem__(self, doc_id):
+        if not 0 <= doc_id < self.index.num_docs:
+            raise IndexError(doc_id)
+        ix = self.index
+        return {
+            'paragraph_id': json.loads(ix.paragraph_ids[doc_id]),
+            'text': ix.texts[doc_id],
+            'language': ix.language,
+            'kingdom_label': ix.kingdoms[ix.doc_kingdoms[doc_id]],
+        }
+
+    def __iter__(self):
+        for doc_id in range(len(self)):
+            yield self[doc_id]
+
+
+# ---------------------------------------------------------
+#  Pickle -> binary converter
+# ---------------------------------------------------------
+def convert_pickle_index(pickle_path, output_path):
+    """Convert an index written by the old pickle save_index into the binary format"""
+    from nlp.retrieval_system import RetrievalSystem
+
+    rs = RetrievalSystem()
+    if not rs.load_index(pickle_path):
+        raise FileNotFoundError(pickle_path)
+    write_index(rs, output_path)
+    return rs.get_index_stats()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Binary retrieval index tools')
+    sub = parser.add_subparsers(dest='command', required=True)
+    convert = sub.add_parser('convert', help='Convert a pickled index to the binary format')
+    convert.add_argument('input', help='Pickled index file')
+    convert.add_argument('output', help='Binary index file to write')
+
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.input):
+        print(f"Input file not found: {args.input}")
+        sys.exit(2)
+    stats = convert_pickle_index(args.input, args.output)
+    for lang, lang_stats in stats.items():
+        print(f"{lang.upper()}: {lang_stats['num_paragraphs']} paragraphs, {lang_stats['num_features']} features")
+    print(f"Wrote binary index to {args.output}")
+
+
+if __name__ == '__main__':
+    # Ensure project root is on sys.path so we can import local packages when run as a script
+    PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+    if str(PROJECT_ROOT) not in sys.path:
+        sys.path.insert(0, str(PROJECT_ROOT))
+    main()
@@ -1,9 +1,29 @@
-import re
+import unicodedata
 from itertools import chain
 from typing import Dict, List
 
+from nlp.aho_corasick import AhoCorasick
+
+
+def _fold(text: str) -> str:
+    """NFC-normalize and lower-case, keeping one output character per input character"""
+    text = unicodedata.normalize("NFC", text)
+    folded = text.lower()
+    if len(folded) == len(text):
+        return folded
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
 class IntentDetector:
-    def __init__(self, gazetteer: Dict[str, Dict[str, List[str]]]):
+    def __init__(self, gazetteer: Dict[str, Dict[str, List[str]]], telugu_boundaries: bool = False):
+        """
+        Name boundaries default to those of the regex \\b (word characters are
+        alphanumerics and "_"). In Telugu that also places a boundary before every
+        vowel sign, so a name matches the stem of an inflected word (కాకతీయ in
+        కాకతీయుల) but a name ending in a vowel sign only matches before a word
+        character. telugu_boundaries=True treats combining marks as word characters,
+        so Telugu names only match as whole words.
+        """
         # 1) Collect names per kingdom (primary/aliases/rulers/places)
         self.k2names = {
             k: list(chain(
@@ -14,26 +34,50 @@ class IntentDetector:
             ))
             for k, d in gazetteer.items()
         }
-        # 2) Precompile word-boundary patterns (case-insensitive)
-        self.k2patterns = {
-            k: [re.compile(rf"\b{re.escape(n)}\b", re.IGNORECASE) for n in names]
-            for k, names in self.k2names.items()
-        }
+        self.telugu_boundaries = telugu_boundaries
+
+        # 2) One automaton over every distinct folded name; a name may belong to several kingdoms
+        name_ids = {}
+        self.name_kingdoms = []  # name id -> kingdoms listing it
+        for k, names in self.k2names.items():
+            for n in names:
+                key = _fold(n)
+                if not key:
+                    continue
+                if key not in name_ids:
+                    name_ids[key] = len(name_ids)
+                    self.name_kingdoms.append([])
+                if k not in self.name_kingdoms[name_ids[key]]:
+                    self.name_kingdoms[name_ids[key]].append(k)
+        self.matcher = AhoCorasick(name_ids)
+
+    def _is_word_char(self, c: str) -> bool:
+        if c.isalnum() or c == "_":
+            return True
+        return self.telugu_boundaries and unicodedata.category(c)[0] == "M"
+
+    def _at_boundary(self, text: str, i: int) -> bool:
+        before = i > 0 and self._is_word_char(text[i - 1])
+        after = i < len(text) and self._is_word_char(text[i])
+        return before != after
+
+    def find_mentions(self, text: str) -> Dict[str, set]:
+        """Kingdom -> set of distinct (folded) gazetteer names mentioned in text, in one pass"""
+        text = _fold(text)
+        mentions = {k: set() for k in self.k2names}
+        names = self.matcher.patterns
+        for start, end, name_id in self.matcher.finditer(text):
+            if self._at_boundary(text, start) and self._at_boundary(text, end):
+                for k in self.name_kingdoms[name_id]:
+                    mentions[k].add(names[name_id])
+        return mentions
 
     def detect_intent(self, tokens: List[str], language: str = None, top_k: int = 3, threshold: int = 1):
         text = " ".join(tokens)
         scores = {}
 
-        for k, pats in self.k2patterns.items():
-            matched = set()
-            s = 0
-            for p in pats:
-                m = p.search(text)
-                if m:
-                    key = m.group(0).lower()  # de-dup same phrase
-                    if key not in matched:
-                        matched.add(key)
-                        s += 1
+        for k, matched in self.find_mentions(text).items():
+            s = len(matched)  # distinct phrases
             if s >= threshold:
                 scores[k] = s
 
@@ -45,4 +89,4 @@ class IntentDetector:
         keep = [k for k, sc in ranked if sc >= 0.5 * best][:top_k]
         confidence = best / sum(scores.values())  # simple 0–1 confidence
 
-        return {"kingdoms": keep, "confidence": round(confidence, 3), "all_scores": dict(ranked)}
\ No newline at end of file
+        return {"kingdoms": keep, "confidence": round(confidence, 3), "all_scores": dict(ranked)}
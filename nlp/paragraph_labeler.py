@@ -2,7 +2,10 @@ import json
 import os
 import sys
 import argparse
-from typing import List, Dict
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import pathlib
 
 # Ensure project root is on sys.path so we can import local packages when run as a script
@@ -31,6 +34,42 @@ def load_paragraphs(filepath: str) -> List[str]:
     return paragraphs
 
 
+READ_CHUNK_CHARS = 1 << 20
+
+
+def _has_separator(filepath: str, separator: str = ';;;') -> bool:
+    """Streaming check for the separator, so the file is never held in memory"""
+    tail = ''
+    with open(filepath, 'r', encoding='utf-8') as f:
+        while True:
+            chunk = f.read(READ_CHUNK_CHARS)
+            if not chunk:
+                return False
+            if separator in tail + chunk:
+                return True
+            tail = chunk[-(len(separator) - 1):]
+
+
+def iter_paragraphs(filepath: str) -> Iterator[str]:
+    """Lazily yield the same paragraphs as load_paragraphs, reading the file in chunks."""
+    separator = ';;;' if _has_separator(filepath) else '\n\n'
+    with open(filepath, 'r', encoding='utf-8') as f:
+        carry = ''
+        while True:
+            chunk = f.read(READ_CHUNK_CHARS)
+            if not chunk:
+                break
+            parts = (carry + chunk).split(separator)
+            carry = parts.pop()  # may continue in the next chunk
+            for part in parts:
+                part = part.strip()
+                if part:
+                    yield part
+        carry = carry.strip()
+        if carry:
+            yield carry
+
+
 def simple_tokenize(text: str) -> List[str]:
     """Very small tokenizer: splits on whitespace and punctuation conservatively."""
     # Keep unicode letters; split on whitespace
@@ -45,29 +84,130 @@ def label_paragraphs(paragraphs: List[str], detector: IntentDetector, language:
     labeled = {}
 
     for idx, para in enumerate(paragraphs):
-        tokens = simple_tokenize(para)
-        result = detector.detect_intent(tokens, language)
+        label = label_paragraph(para, detector, language)
+        if label is not None:
+            labeled[idx] = label
+
+    return labeled
+
+
+def label_paragraph(para: str, detector: IntentDetector, language: str = 'auto') -> Optional[Dict]:
+    """Label info for one paragraph, or None when no kingdom is detected"""
+    tokens = simple_tokenize(para)
+    result = detector.detect_intent(tokens, language)
+
+    kingdoms = result.get('kingdoms', [])
+    confidence = result.get('confidence', 0.0)
+
+    # Keep paragraph only if at least one kingdom detected
+    if not kingdoms:
+        return None
+    return {
+        'paragraph': para,
+        'kingdoms': kingdoms,
+        'confidence': confidence,
+        'all_scores': result.get('all_scores', {})
+    }
+
+
+# ===== Streaming pipeline =====
+
+_worker_detector = None
 
-        kingdoms = result.get('kingdoms', [])
-        confidence = result.get('confidence', 0.0)
 
-        # Keep paragraph only if at least one kingdom detected
-        if kingdoms:
-            labeled[idx] = {
-                'paragraph': para,
-                'kingdoms': kingdoms,
-                'confidence': confidence,
-                'all_scores': result.get('all_scores', {})
-            }
+def _init_worker():
+    global _worker_detector
+    _worker_detector = IntentDetector(get_gazetteer())
 
+
+def _label_chunk(start: int, paragraphs: List[str], language: str) -> List[Tuple[int, Dict]]:
+    labeled = []
+    for idx, para in enumerate(paragraphs, start):
+        label = label_paragraph(para, _worker_detector, language)
+        if label is not None:
+            labeled.append((idx, label))
     return labeled
 
 
+def _chunks(paragraphs: Iterable[str], chunk_size: int) -> Iterator[Tuple[int, List[str]]]:
+    it = iter(paragraphs)
+    start = 0
+    while True:
+        chunk = list(islice(it, chunk_size))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+def label_stream(paragraphs: Iterable[str], language: str = 'auto', workers: int = 1,
+                 chunk_size: int = 256) -> Iterator[Tuple[int, Dict]]:
+    """
+    Yield (index, label info) for labeled paragraphs, in input order.
+
+    Paragraphs are consumed lazily. With workers > 1, chunks are labeled in a
+    process pool with at most 2 * workers chunks in flight, so memory stays
+    bounded however long the input is.
+    """
+    if workers <= 1:
+        _init_worker()
+        for start, chunk in _chunks(paragraphs, chunk_size):
+            yield from _label_chunk(start, chunk, language)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        in_flight = deque()
+        for start, chunk in _chunks(paragraphs, chunk_size):
+            in_flight.append(pool.submit(_label_chunk, start, chunk, language))
+            if len(in_flight) >= 2 * workers:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+
+def write_jsonl(labeled: Iterable[Tuple[int, Dict]], output: str) -> int:
+    """Write one {"index": ..., **label} object per line as labels arrive; returns the count"""
+    count = 0
+    with open(output, 'w', encoding='utf-8') as f:
+        for idx, label in labeled:
+            f.write(json.dumps({'index': idx, **label}, ensure_ascii=False) + '\n')
+            count += 1
+    return count
+
+
+def compact_jsonl(jsonl_path: str, output: str) -> int:
+    """
+    Rewrite a JSON Lines label file in the original single-JSON format
+    ({index: label info}, indent=2), one record at a time.
+    """
+    count = 0
+    with open(jsonl_path, 'r', encoding='utf-8') as src, open(output, 'w', encoding='utf-8') as dst:
+        dst.write('{')
+        for line in src:
+            if not line.strip():
+                continue
+            label = json.loads(line)
+            idx = label.pop('index')
+            body = json.dumps(label, ensure_ascii=False, indent=2).replace('\n', '\n  ')
+            dst.write((',' if count else '') + f'\n  {json.dumps(str(idx))}: {body}')
+            count += 1
+        dst.write('\n}' if count else '}')
+    return count
+
+
 def main(argv=None):
     parser = argparse.ArgumentParser(description='Label paragraphs with kingdom intents')
     parser.add_argument('input', help='Input paragraphs file')
-    parser.add_argument('--output', '-o', default='data/labeled_paragraphs.json', help='Output JSON file')
+    parser.add_argument('--output', '-o', default=None,
+                        help='Output file (default data/labeled_paragraphs.json, or .jsonl with --stream)')
     parser.add_argument('--lang', '-l', default='auto', help='Language hint (not used by current detector)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Read paragraphs lazily and write JSON Lines incrementally')
+    parser.add_argument('--workers', '-w', type=int, default=os.cpu_count() or 1,
+                        help='Labeling processes in --stream mode')
+    parser.add_argument('--chunk-size', type=int, default=256, help='Paragraphs per worker task in --stream mode')
+    parser.add_argument('--compact', metavar='JSON', default=None,
+                        help='With --stream, also write the labels in the single-JSON format')
 
     args = parser.parse_args(argv)
 
@@ -75,6 +215,25 @@ def main(argv=None):
         print(f"Input file not found: {args.input}")
         sys.exit(2)
 
+    if args.output is None:
+        args.output = 'data/labeled_paragraphs.jsonl' if args.stream else 'data/labeled_paragraphs.json'
+
+    # Ensure output directory exists
+    for path in (args.output, args.compact):
+        out_dir = os.path.dirname(path) if path else ''
+        if out_dir and not os.path.exists(out_dir):
+            os.makedirs(out_dir, exist_ok=True)
+
+    if args.stream:
+        labeled = label_stream(iter_paragraphs(args.input), language=args.lang,
+                               workers=args.workers, chunk_size=args.chunk_size)
+        count = write_jsonl(labeled, args.output)
+        print(f"Wrote {count} labeled paragraphs to {args.output}")
+        if args.compact:
+            compact_jsonl(args.output, args.compact)
+            print(f"Compacted labels to {args.compact}")
+        return
+
     paragraphs = load_paragraphs(args.input)
 
     gazetteer = get_gazetteer()
@@ -82,11 +241,6 @@ def main(argv=None):
 
     labeled = label_paragraphs(paragraphs, detector, language=args.lang)
 
-    # Ensure output directory exists
-    out_dir = os.path.dirname(args.output)
-    if out_dir and not os.path.exists(out_dir):
-        os.makedirs(out_dir, exist_ok=True)
-
     with open(args.output, 'w', encoding='utf-8') as f:
         json.dump(labeled, f, ensure_ascii=False, indent=2)
 
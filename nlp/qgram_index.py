@@ -0,0 +1,68 @@
+"""
+Count-filtered, length-bucketed n-gram candidate index for NgramSpellChecker.
+
+A single edit destroys at most q of a word's q-grams, so two words within
+edit distance k share at least max(|G(s)|, |G(t)|) - k*q distinct q-grams,
+where G(w) is the set of distinct q-grams of w, and their lengths differ by
+at most k. Postings are bucketed by word length so a lookup only merges the
+buckets within k of the misspelling's length, counting shared grams per
+word; words below the count bound can never be within k edits and are
+dropped before any edit-distance computation. The bound is necessary, not
+sufficient, so the few words that pass it are checked with a bounded edit
+distance: the candidates are exactly the words within k edits.
+"""
+
+from collections import Counter
+
+
+def ngrams(word, n):
+    return [word[i:i+n] for i in range(len(word) - n + 1)]
+
+
+class QgramCountIndex:
+    """gram -> word length -> words, per n-gram size"""
+
+    def __init__(self, words, distance, sizes=(1, 2, 3)):
+        """
+        words: vocabulary to index
+        distance: bounded edit distance, called as distance(a, b, max_dist=...)
+        """
+        self.distance = distance
+        self.postings = {n: {} for n in sizes}
+        self.gram_counts = {n: {} for n in sizes}  # word -> number of distinct n-grams
+        for word in words:
+            length = len(word)
+            for n in sizes:
+                grams = set(ngrams(word, n))
+                self.gram_counts[n][word] = len(grams)
+                postings = self.postings[n]
+                for gram in grams:
+                    postings.setdefault(gram, {}).setdefault(length, []).append(word)
+
+    def candidates(self, word, n, max_distance):
+        """
+        Words within max_distance edits of `word` that share at least one n-gram
+        with it; the length and count filters decide which ones are verified.
+        """
+        postings = self.postings.get(n)
+        if postings is None:
+            raise ValueError("n must be 1, 2, or 3")
+
+        grams = set(ngrams(word, n))
+        lengths = range(len(word) - max_distance, len(word) + max_distance + 1)
+        shared = Counter()
+        for gram in grams:
+            buckets = postings.get(gram)
+            if not buckets:
+                continue
+            for length in lengths:
+                bucket = buckets.get(length)
+                if bucket:
+                    shared.update(bucket)
+
+        slack = max_distance * n
+        min_shared = len(grams) - slack
+        gram_counts = self.gram_counts[n]
+        return {cand for cand, count in shared.items()
+                if count >= min_shared and count >= gram_counts[cand] - slack
+                and self.distance(word, cand, max_dist=max_distance) <= max_distance}
@@ -0,0 +1,113 @@
+"""
+Query-result cache for RetrievalSystem.
+
+An entry holds only what ranking produced: a tuple of (doc_id, score) pairs
+and the candidate count. The paragraph texts are resolved from the index's
+metadata every time a result is read, so entries stay small whatever the
+paragraph lengths, and every caller gets freshly built dicts it is free to
+modify. Entries are immutable tuples.
+
+The cache is an LRU bounded both by entry count and by the approximate bytes
+its entries hold; entries may also expire after `ttl` seconds. Doc ids are
+only meaningful for the index they were ranked on, so RetrievalSystem clears
+the cache whenever its index changes.
+"""
+
+import sys
+import time
+from collections import OrderedDict, namedtuple
+
+CachedResult = namedtuple('CachedResult', ['ranked', 'total_candidates'])
+
+# Approximate size of one (doc_id, score) pair, and of an entry's fixed parts
+# (the record, its OrderedDict slot and bookkeeping) besides its key
+_PAIR_BYTES = sys.getsizeof((0, 0.0)) + sys.getsizeof(1 << 20) + sys.getsizeof(0.0)
+_ENTRY_BYTES = sys.getsizeof(CachedResult((), 0)) + sys.getsizeof((None, 0.0, 0)) + 100
+
+
+def entry_bytes(key, ranked):
+    """Approximate memory held by a cache entry"""
+    return sys.getsizeof(key) + _ENTRY_BYTES + sys.getsizeof(ranked) + len(ranked) * _PAIR_BYTES
+
+
+class ResultCache:
+    """
+    LRU of CachedResult keyed by query key, holding at most max_entries entries and
+    about max_bytes bytes; entries older than ttl seconds (None: no expiry) are
+    dropped when read. max_entries=0 or max_bytes=0 disables caching.
+    """
+
+    def __init__(self, max_entries=100, max_bytes=1 << 20, ttl=None, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.clock = clock
+        self.entries = OrderedDict()  # key -> (CachedResult, expires at or None, bytes)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """The CachedResult stored under key, or None"""
+        slot = self.entries.get(key)
+        if slot is not None:
+            result, expires, _ = slot
+            if expires is None or self.clock() < expires:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return result
+            self._drop(key)
+            self.expirations += 1
+        self.misses += 1
+        return None
+
+    def put(self, key, ranked, total_candidates):
+        """Store a ranking under key; returns it as a CachedResult whether or not it was kept"""
+        result = CachedResult(tuple(map(tuple, ranked)), total_candidates)
+        size = entry_bytes(key, result.ranked)
+        if key in self.entries:
+            self._drop(key)
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return result
+
+        expires = None if self.ttl is None else self.clock() + self.ttl
+        self.entries[key] = (result, expires, size)
+        self.bytes += size
+        while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+            self._drop(next(iter(self.entries)))
+            self.evictions += 1
+        return result
+
+    def _drop(self, key):
+        self.bytes -= self.entries.pop(key)[2]
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'cache_size': len(self.entries),
+            'max_cache_size': self.max_entries,
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'hit_rate': (self.hits / total * 100) if total else 0
+        }
+
+    def __getstate__(self):
+        # Expiry times are on this process's clock; a pickled cache starts empty
+        state = self.__dict__.copy()
+        state['entries'] = OrderedDict()
+        state['bytes'] = 0
+        return state
@@ -2,25 +2,151 @@ import math
 import os
 import pickle
 import hashlib
-from collections import Counter, OrderedDict, defaultdict
+import heapq
+import re
+from collections import Counter, defaultdict
+
+from nlp.compact_index import CompactShard, FeatureTable, build_compact_postings, build_compact_shard
+from nlp.index_store import MappedIndexFile, is_index_file, write_index
+from nlp.result_cache import ResultCache
+from nlp.sparse_backend import SparseTfidfIndex, sparse_backend_available
+from nlp.text_processor import TELUGU_BLOCK_RE, split_aksharas
+
+# A word of a Telugu paragraph: a run of the Telugu block ('te'), or of other letters / digits
+TE_WORD_RE = re.compile(rf'(?P<te>{TELUGU_BLOCK_RE})|[^\W_\u0C00-\u0C7F]+')
+
+
+class DocFreqIdf:
+    """Mapping-like term -> idf, computed on access from a language's document frequencies"""
+
+    def __init__(self, doc_freqs, num_docs):
+        self.doc_freqs = doc_freqs
+        self.num_docs = num_docs
+
+    def get(self, term, default=None):
+        freq = self.doc_freqs.get(term)
+        if not freq:
+            return default
+        return math.log((1 + self.num_docs) / (1 + freq)) + 1
+
+    def __getitem__(self, term):
+        value = self.get(term)
+        if value is None:
+            raise KeyError(term)
+        return value
+
+    def __len__(self):
+        return len(self.doc_freqs)
 
 class RetrievalSystem:
     """
     TF-IDF based retrieval system (manual implementation) with cosine similarity
     Works for both English (word-level) and Telugu (char-level n-grams)
+    Search walks a term -> postings inverted index, so only documents sharing a
+    query term are scored. Postings are sharded by kingdom, so a kingdom
+    filtered search only touches that kingdom's documents
+
+    backend='python' scores with dict postings; backend='sparse' stores each
+    language as a float32 CSR matrix of term counts (needs numpy + scipy) and
+    scores with a sparse mat-vec. Both return the same rankings.
+
+    Postings hold raw term counts and IDF is derived from document frequencies,
+    so add_documents / delete_documents / replace_document only tokenize the
+    changed paragraphs. The next search refreshes the weights incrementally:
+    IDF is computed on access, a document's norm is kept as sums over its
+    terms that are only updated if one of its terms changed document
+    frequency, and the sparse backend patches the changed documents' columns.
+
+    save_index writes a binary index that load_index memory-maps and queries
+    in place (see nlp/index_store.py); a mapped language is copied into memory
+    only if it is modified. A pickled system stores the path of its mapped
+    languages and maps the file again when unpickled.
+
+    te_features selects the Telugu terms: 'char' indexes every 2-4 character
+    substring of the paragraph; 'akshara' indexes 1-2 akshara (syllable)
+    n-grams inside each Telugu word, so no term splits a grapheme cluster or
+    spans two words (words in other scripts are indexed whole).
+
+    search(..., scoring='bm25') ranks by Okapi BM25 (bm25_k1, bm25_b) instead
+    of cosine similarity, over the same postings. Query terms are processed
+    in decreasing order of their maximum possible contribution (MaxScore):
+    once the terms left cannot lift an unseen document into the top_k, no new
+    candidates are admitted, candidates that can no longer reach it are
+    dropped, and the remaining terms only update the survivors.
+
+    Languages in compact_languages (Telugu by default, whose char n-grams make
+    hundreds of terms per paragraph) intern their terms to integer ids and keep
+    the per-document counts and the postings in arrays (see
+    nlp/compact_index.py). Rankings are the same either way; the postings of a
+    compact language are built in bulk, then take updates in per-shard deltas
+    that a refresh merges once they outgrow CompactShard.MERGE_FRACTION.
+
+    Results are cached as (doc_id, score) rankings, at most cache_size of them
+    and about cache_bytes in total, each for cache_ttl seconds (None: until the
+    index changes); see nlp/result_cache.py. Every search returns newly built
+    result dicts, cached or not.
     """
 
-    def __init__(self, corpus_data=None, cache_size=100):
+    BACKENDS = ('python', 'sparse')
+    TE_FEATURES = ('char', 'akshara')
+    SCORING = ('cosine', 'bm25')
+    # Queries scored per query-matrix product in search_many
+    SEARCH_MANY_CHUNK = 256
+
+    def __init__(self, corpus_data=None, cache_size=100, backend='python', compact_languages=('te',),
+                 te_features='char', bm25_k1=1.2, bm25_b=0.75, cache_bytes=1 << 20, cache_ttl=None):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"backend must be one of {self.BACKENDS}")
+        if te_features not in self.TE_FEATURES:
+            raise ValueError(f"te_features must be one of {self.TE_FEATURES}")
+        self.te_features = te_features
+        self.bm25_k1 = bm25_k1
+        self.bm25_b = bm25_b
+        if backend == 'sparse' and not sparse_backend_available():
+            print("Warning: numpy/scipy not installed. Falling back to the python backend.")
+            backend = 'python'
+        self.backend = backend
+        self.compact_languages = frozenset(compact_languages)
+        # Term intern tables of the compact languages
+        self.feature_tables = {lang: FeatureTable() for lang in self.compact_languages}
         self.corpus_data = corpus_data or []
         self.vectorizers = {'en': None, 'te': None}
-        self.tfidf_matrices = {'en': None, 'te': None}
+        # Per-document state, indexed by doc_id; deleted documents leave a None slot
         self.paragraph_metadata = {'en': [], 'te': []}
+        self.term_counts = {'en': [], 'te': []}
+        self.doc_lengths = {'en': [], 'te': []}
+        self.doc_freqs = {'en': Counter(), 'te': Counter()}
+        # Inverted index sharded by kingdom:
+        # kingdom -> term -> list of (doc_id, term count)
+        self.postings = {'en': None, 'te': None}
+        # kingdom -> set of doc ids of that kingdom
+        self.kingdom_doc_ids = {'en': {}, 'te': {}}
+        # paragraph_id -> doc ids carrying it
+        self.paragraph_locations = {'en': {}, 'te': {}}
+        # L2 norm of every document's (count * idf) vector, refreshed with the IDF
+        self.doc_norms = {'en': None, 'te': None}
+        # Per document, the sums over its terms of c², c²·l and c²·l² (c = count,
+        # l = log(1 + df)). As idf = A - l with A = log(1 + N) + 1, the squared norm
+        # is A²·Σc² - 2A·Σc²l + Σc²l², so only documents holding a term whose df
+        # changed need their sums updated (python backend)
+        self.norm_sums = {'en': None, 'te': None}
+        # CSR matrices for the sparse backend
+        self.sparse_indices = {'en': None, 'te': None}
+        # Languages whose IDF / norms / sparse matrices lag behind the postings
+        self._stale = {'en': False, 'te': False}
+        # Since the last refresh: the previous df of every term whose df changed (None
+        # after a (re)build: everything is recomputed), and the doc ids indexed or removed
+        self._df_changes = {'en': None, 'te': None}
+        self._changed_docs = {'en': set(), 'te': set()}
+        # Memory-mapped, read-only language indexes opened by load_index, and their file
+        self.mapped_indices = {'en': None, 'te': None}
+        self.mapped_path = None
+        # BM25 length normalizers and per-term idf / score bounds, see _bm25_state
+        self.bm25_states = {'en': None, 'te': None}
 
         # Cache system
         self.cache_size = cache_size
-        self.query_cache = OrderedDict()
-        self.cache_hits = 0
-        self.cache_misses = 0
+        self.query_cache = ResultCache(cache_size, cache_bytes, cache_ttl)
 
         if corpus_data:
             self.build_index()
@@ -48,116 +174,367 @@ class RetrievalSystem:
         text = text.strip()
         ngrams = []
         for n in range(n_range[0], n_range[1]+1):
-            for i in range(len(text) - n + 1):
-                ngrams.append(text[i:i+n])
+            ngrams.extend([text[i:i+n] for i in range(len(text) - n + 1)])
         return ngrams or [text]  # fallback if too short
 
+    def _akshara_ngrams_te(self, text, n_range=(1,2)):
+        # Telugu: n-grams of aksharas, never crossing a word boundary; other words are kept whole
+        ngrams = []
+        for match in TE_WORD_RE.finditer(text):
+            if match.group('te') is None:
+                ngrams.append(match.group().lower())
+                continue
+            aksharas = split_aksharas(match.group())
+            for n in range(n_range[0], n_range[1]+1):
+                ngrams.extend([''.join(aksharas[i:i+n]) for i in range(len(aksharas) - n + 1)])
+        return ngrams or [text.strip()]  # fallback if there are no words
+
+    def _tokenize(self, text, language):
+        if language == 'te':
+            if self.te_features == 'akshara':
+                return self._akshara_ngrams_te(text)
+            return self._char_ngrams_te(text)
+        return self._tokenize_en(text)
+
     # ---------------------------------------------------------
     #  Build the TF-IDF index manually
     # ---------------------------------------------------------
     def build_index(self):
+        self._materialize_all()
         en_docs = [d for d in self.corpus_data if d['language'] == 'en']
         te_docs = [d for d in self.corpus_data if d['language'] == 'te']
 
-        if en_docs:
-            self._build_language_index(en_docs, 'en')
-        if te_docs:
-            self._build_language_index(te_docs, 'te')
+        self._build_language_index(en_docs, 'en')
+        self._build_language_index(te_docs, 'te')
+        self._invalidate_cache()
 
     def _build_language_index(self, data, language):
         """
         Build TF-IDF manually for a specific language
         """
-        texts = [item['text'] for item in data]
+        self._reset_language(language)
+        self._index_documents(data, language)
+        self._refresh_weights(language)
+
+    def _reset_language(self, language):
+        self.mapped_indices[language] = None
+        self.vectorizers[language] = None
+        self.paragraph_metadata[language] = []
+        self.term_counts[language] = []
+        self.doc_lengths[language] = []
+        self.doc_freqs[language] = Counter()
+        # Compact postings are built in bulk by _refresh_weights (or by BM25 on the sparse backend)
+        self.postings[language] = {} if self.backend == 'python' and not self._compact(language) else None
+        if self._compact(language):
+            self.feature_tables[language] = FeatureTable()
+        self.kingdom_doc_ids[language] = {}
+        self.paragraph_locations[language] = {}
+        self.doc_norms[language] = None
+        self.norm_sums[language] = None
+        self.sparse_indices[language] = None
+        self.bm25_states[language] = None
+        self._df_changes[language] = None
+        self._changed_docs[language] = set()
+
+    def _index_documents(self, data, language):
+        """
+        Tokenize new paragraphs and append them to the postings. Cost is
+        proportional to the batch; IDF and norms are refreshed lazily.
+        """
+        for item in data:
+            self.paragraph_metadata[language].append(None)
+            self.term_counts[language].append(None)
+            self.doc_lengths[language].append(0)
+            self._index_document(item, language, len(self.paragraph_metadata[language]) - 1)
+        if data:
+            self._stale[language] = True
+
+    def _compact(self, language):
+        return language in self.compact_languages
+
+    def _index_document(self, item, language, doc_id):
+        counts = Counter(self._tokenize(item['text'], language))
+        kingdom = item['kingdom_label']
+        self._note_change(language, doc_id, counts)
+        self.doc_freqs[language].update(counts.keys())
+        if self._compact(language):
+            counts = self.feature_tables[language].counts(counts)
+
+        self.paragraph_metadata[language][doc_id] = item
+        self.term_counts[language][doc_id] = counts
+        self.doc_lengths[language][doc_id] = sum(counts.values()) or 1
+        self.kingdom_doc_ids[language].setdefault(kingdom, set()).add(doc_id)
+        self.paragraph_locations[language].setdefault(item.get('paragraph_id'), []).append(doc_id)
+
+        if self.postings[language] is None:
+            return
+        if self._compact(language):
+            shard = self.postings[language].get(kingdom)
+            if shard is None:
+                shard = self.postings[language][kingdom] = CompactShard.empty(self.feature_tables[language])
+            shard.add(doc_id, counts)
+        else:
+            shard = self.postings[language].setdefault(kingdom, {})
+            for term, count in counts.items():
+                plist = shard.get(term)
+                if plist is None:
+                    shard[term] = [(doc_id, count)]
+                else:
+                    plist.append((doc_id, count))
+
+    def _remove_document(self, language, doc_id):
+        item = self.paragraph_metadata[language][doc_id]
+        counts = self.term_counts[language][doc_id]
+        kingdom = item['kingdom_label']
+
+        self._note_change(language, doc_id, counts)
+        df = self.doc_freqs[language]
+        for term in counts:
+            df[term] -= 1
+            if df[term] <= 0:
+                del df[term]
+
+        if self.postings[language] is not None and self._compact(language):
+            self.postings[language][kingdom].remove(doc_id, counts)
+        elif self.postings[language] is not None:
+            shard = self.postings[language].get(kingdom, {})
+            for term in counts:
+                plist = [p for p in shard.get(term, ()) if p[0] != doc_id]
+                if plist:
+                    shard[term] = plist
+                else:
+                    shard.pop(term, None)
+
+        self.kingdom_doc_ids[language][kingdom].discard(doc_id)
+        locations = self.paragraph_locations[language].get(item.get('paragraph_id'), [])
+        if doc_id in locations:
+            locations.remove(doc_id)
+            if not locations:
+                del self.paragraph_locations[language][item.get('paragraph_id')]
+
+        self.paragraph_metadata[language][doc_id] = None
+        self.term_counts[language][doc_id] = None
+        self.doc_lengths[language][doc_id] = 0
+        self._stale[language] = True
+        return item
+
+    def _note_change(self, language, doc_id, terms):
+        """Record a document about to be indexed or removed, and its terms' current dfs"""
+        changes = self._df_changes[language]
+        if changes is None:
+            return
+        df = self.doc_freqs[language]
+        for term in terms:
+            if term not in changes:
+                changes[term] = df.get(term, 0)
+        self._changed_docs[language].add(doc_id)
+
+    def _refresh_weights(self, language):
+        """
+        Bring IDF and the document norms (python backend) or the CSR matrix (sparse
+        backend) up to date with the postings. After a (re)build they are computed
+        from all the counts; after updates only the changed documents are re-read, and
+        the others' norms move with the dfs of their terms. No re-tokenization.
+        """
+        num_docs = self._live_count(language)
+        self.vectorizers[language] = {'idf': DocFreqIdf(self.doc_freqs[language], num_docs)}
+        self.bm25_states[language] = None
+
+        if self._compact(language):
+            if self.postings[language] is not None:
+                self._merge_compact_shards(language)
+            elif self.backend == 'python':
+                self.postings[language] = self._postings_from_counts(language)
 
-        # Tokenize each paragraph
-        tokenized_docs = []
-        for text in texts:
-            if language == 'te':
-                tokens = self._char_ngrams_te(text)
+        rebuild = self._df_changes[language] is None
+        if self.backend == 'sparse':
+            self._update_sparse_index(language, rebuild)
+            self.sparse_indices[language].reweight(num_docs)
+        else:
+            if rebuild:
+                self._build_norm_sums(language)
             else:
-                tokens = self._tokenize_en(text)
-            tokenized_docs.append(tokens)
-
-        # Compute document frequencies
-        df = Counter()
-        for tokens in tokenized_docs:
-            unique_terms = set(tokens)
-            for term in unique_terms:
-                df[term] += 1
-
-        num_docs = len(tokenized_docs)
-        # Compute IDF
-        idf = {term: math.log((1 + num_docs) / (1 + freq)) + 1 for term, freq in df.items()}
-
-        # Build TF-IDF matrix
-        tfidf_vectors = []
-        for tokens in tokenized_docs:
-            tf = Counter(tokens)
-            total_terms = sum(tf.values()) or 1
-            tfidf = {}
-            for term, freq in tf.items():
-                tfidf[term] = (freq / total_terms) * idf.get(term, 0)
-            tfidf_vectors.append(tfidf)
-
-        # Save to class
-        self.tfidf_matrices[language] = tfidf_vectors
-        self.vectorizers[language] = {'idf': idf, 'terms': list(idf.keys())}
-        self.paragraph_metadata[language] = data
+                self._update_norm_sums(language)
+            a = math.log(1 + num_docs) + 1
+            self.doc_norms[language] = [math.sqrt(a * a * s0 - 2 * a * s1 + s2) if s0 else 0.0
+                                        for s0, s1, s2 in zip(*self.norm_sums[language])]
+        self._df_changes[language] = {}
+        self._changed_docs[language] = set()
+        self._stale[language] = False
+
+    def _update_sparse_index(self, language, rebuild):
+        metadata = self.paragraph_metadata[language]
+        counts = self.term_counts[language]
+        if rebuild:
+            self.sparse_indices[language] = SparseTfidfIndex(
+                counts, [doc['kingdom_label'] if doc else None for doc in metadata])
+        elif self._changed_docs[language]:
+            changed = self._changed_docs[language]
+            self.sparse_indices[language].update(
+                {doc_id: counts[doc_id] for doc_id in changed},
+                {doc_id: metadata[doc_id]['kingdom_label'] if metadata[doc_id] else None for doc_id in changed})
+
+    @staticmethod
+    def _doc_norm_sums(counts, logs):
+        """(Σc², Σc²·l, Σc²·l²) over a document's {term: count}, l = logs[term] = log(1 + df)"""
+        s0 = s1 = s2 = 0.0
+        for term, count in counts.items():
+            c2 = count * count
+            l = logs[term]
+            s0 += c2
+            s1 += c2 * l
+            s2 += c2 * l * l
+        return s0, s1, s2
+
+    def _build_norm_sums(self, language):
+        counts = self.term_counts[language]
+        df = self.doc_freqs[language]
+        if self._compact(language):
+            logs = [math.log(1 + df[term]) for term in self.feature_tables[language].terms]
+            sums = [c.norm_sums(logs) if c else (0.0, 0.0, 0.0) for c in counts]
+        else:
+            logs = {term: math.log(1 + freq) for term, freq in df.items()}
+            sums = [self._doc_norm_sums(c, logs) if c else (0.0, 0.0, 0.0) for c in counts]
+        self.norm_sums[language] = [list(column) for column in zip(*sums)] if sums else [[], [], []]
+
+    def _update_norm_sums(self, language):
+        """
+        Recompute the sums of the changed documents, and shift those of the other
+        documents holding a term whose df changed by count² times the change of l / l²
+        """
+        s0, s1, s2 = self.norm_sums[language]
+        counts = self.term_counts[language]
+        for column in (s0, s1, s2):
+            column.extend([0.0] * (len(counts) - len(column)))
+        df = self.doc_freqs[language]
+        shards = self.postings[language].values()
+        for term, old in self._df_changes[language].items():
+            new = df.get(term, 0)
+            if new == old or not old or not new:
+                # A term appearing or disappearing is only held by changed documents
+                continue
+            l_old, l_new = math.log(1 + old), math.log(1 + new)
+            d1, d2 = l_new - l_old, l_new * l_new - l_old * l_old
+            for shard in shards:
+                for doc_id, count in shard.get(term, ()):
+                    c2 = count * count
+                    s1[doc_id] += c2 * d1
+                    s2[doc_id] += c2 * d2
+        # Changed documents are recomputed, overwriting any shift applied above
+        changed = [doc_id for doc_id in self._changed_docs[language] if counts[doc_id]]
+        logs = {term: math.log(1 + df[term]) for doc_id in changed for term in counts[doc_id]}
+        for doc_id in self._changed_docs[language]:
+            s0[doc_id], s1[doc_id], s2[doc_id] = (self._doc_norm_sums(counts[doc_id], logs)
+                                                  if counts[doc_id] else (0.0, 0.0, 0.0))
+
+    def _merge_compact_shards(self, language):
+        """Rebuild the compact shards whose deltas have outgrown CompactShard.MERGE_FRACTION"""
+        shards = self.postings[language]
+        for kingdom, shard in shards.items():
+            if shard.needs_merge():
+                shards[kingdom] = build_compact_shard(self.feature_tables[language], self.term_counts[language],
+                                                      sorted(self.kingdom_doc_ids[language].get(kingdom, ())))
+
+    def _ensure_fresh(self, language):
+        if self._stale[language]:
+            self._refresh_weights(language)
+
+    def _weighted_counts(self, language, doc_id):
+        """count * idf vector of a document (its TF-IDF vector scaled by doc length)"""
+        counts = self.term_counts[language][doc_id]
+        if not counts:
+            return {}
+        idf = self.vectorizers[language]['idf']
+        return {t: c * idf[t] for t, c in counts.items()}
+
+    def get_tfidf_vector(self, language, doc_id):
+        """TF-IDF vector {term: (count / doc length) * idf} of an indexed paragraph"""
+        self._materialize(language)
+        self._ensure_fresh(language)
+        length = self.doc_lengths[language][doc_id] or 1
+        return {t: w / length for t, w in self._weighted_counts(language, doc_id).items()}
+
+    def _live_count(self, language):
+        if self.mapped_indices[language] is not None:
+            return self.mapped_indices[language].num_docs
+        return sum(len(ids) for ids in self.kingdom_doc_ids[language].values())
 
     # ---------------------------------------------------------
     #  Cache utilities
     # ---------------------------------------------------------
-    def _generate_cache_key(self, query, language, target_kingdoms, top_k):
+    def _generate_cache_key(self, query, language, target_kingdoms, top_k, scoring='cosine',
+                            min_similarity=0.01):
         kingdoms_str = ','.join(sorted(target_kingdoms)) if target_kingdoms else 'all'
-        key_str = f"{query}|{language}|{kingdoms_str}|{top_k}"
+        key_str = f"{query}|{language}|{kingdoms_str}|{top_k}|{scoring}|{min_similarity!r}"
         return hashlib.md5(key_str.encode()).hexdigest()
 
-    def _get_from_cache(self, key):
-        if key in self.query_cache:
-            self.cache_hits += 1
-            self.query_cache.move_to_end(key)
-            return self.query_cache[key]
-        self.cache_misses += 1
-        return None
-
-    def _add_to_cache(self, key, result):
-        self.query_cache[key] = result
-        self.query_cache.move_to_end(key)
-        if len(self.query_cache) > self.cache_size:
-            self.query_cache.popitem(last=False)
+    def _invalidate_cache(self):
+        # Cached doc ids refer to the index they were ranked on
+        self.query_cache.clear()
 
     def get_cache_stats(self):
-        total = self.cache_hits + self.cache_misses
-        hit_rate = (self.cache_hits / total * 100) if total else 0
-        return {
-            'cache_size': len(self.query_cache),
-            'max_cache_size': self.cache_size,
-            'hits': self.cache_hits,
-            'misses': self.cache_misses,
-            'hit_rate': hit_rate
-        }
+        return self.query_cache.stats()
 
     # ---------------------------------------------------------
     #  Manual cosine similarity
     # ---------------------------------------------------------
-    def _cosine_similarity(self, vec1, vec2):
-        all_terms = set(vec1.keys()) | set(vec2.keys())
-        dot = sum(vec1.get(t, 0) * vec2.get(t, 0) for t in all_terms)
-        norm1 = math.sqrt(sum(v**2 for v in vec1.values()))
-        norm2 = math.sqrt(sum(v**2 for v in vec2.values()))
+    def _vector_norm(self, vec):
+        return math.sqrt(sum(v * v for v in vec.values()))
+
+    def _cosine_similarity(self, vec1, vec2, norm1=None, norm2=None):
+        """
+        Sparse dot product over the smaller vector's keys.
+        Pass precomputed norms to avoid recomputing them per call.
+        """
+        if norm1 is None:
+            norm1 = self._vector_norm(vec1)
+        if norm2 is None:
+            norm2 = self._vector_norm(vec2)
         if norm1 == 0 or norm2 == 0:
             return 0.0
+        if len(vec1) > len(vec2):
+            vec1, vec2 = vec2, vec1
+        dot = 0.0
+        get = vec2.get
+        for term, weight in vec1.items():
+            other = get(term)
+            if other is not None:
+                dot += weight * other
         return dot / (norm1 * norm2)
 
+    # ---------------------------------------------------------
+    #  Inverted index scoring
+    # ---------------------------------------------------------
+    def _score_postings(self, query_vec, language, target_kingdoms=None):
+        """
+        Accumulate query/document dot products by walking the postings of each query term
+        in the requested kingdom shards (all shards if target_kingdoms is empty).
+        Document weights are count * idf, with the IDF applied here at query time.
+        Returns {doc_id: dot}, containing only documents that share a term with the query.
+        """
+        idf = self.vectorizers[language]['idf']
+        scores = defaultdict(float)
+        for shard in self._postings_shards(language, target_kingdoms):
+            for term, q_weight in query_vec.items():
+                plist = shard.get(term)
+                if not q_weight or not plist:
+                    continue
+                weight = q_weight * idf[term]
+                for doc_id, count in plist:
+                    scores[doc_id] += weight * count
+        return scores
+
+    def _postings_shards(self, language, target_kingdoms):
+        shards = self.postings[language] or {}
+        if not target_kingdoms:
+            return list(shards.values())
+        return [shards[k] for k in set(target_kingdoms) if k in shards]
+
     # ---------------------------------------------------------
     #  Query Vectorization
     # ---------------------------------------------------------
     def _vectorize_query(self, query, language):
-        if language == 'te':
-            tokens = self._char_ngrams_te(query)
-        else:
-            tokens = self._tokenize_en(query)
+        tokens = self._tokenize(query, language)
 
         tf = Counter(tokens)
         total = sum(tf.values()) or 1
@@ -165,71 +542,335 @@ class RetrievalSystem:
         tfidf_query = {t: (freq / total) * idf.get(t, 0) for t, freq in tf.items()}
         return tfidf_query
 
+    # ---------------------------------------------------------
+    #  BM25
+    # ---------------------------------------------------------
+    # Slack when comparing score bounds with the top_k threshold, so that pruning
+    # never drops a document that would tie with it after rounding to 4 decimals
+    BM25_PRUNE_MARGIN = 1e-4
+
+    def _bm25_state(self, language):
+        """
+        Per-language BM25 data, built on first use after each index change:
+        k1 * (1 - b + b * dl / avgdl) per document, and memos of each term's idf
+        and of its largest contribution to any document (its MaxScore bound).
+        """
+        state = self.bm25_states[language]
+        if state is not None:
+            return state
+        mapped = self.mapped_indices[language]
+        if mapped is None and self.postings[language] is None:
+            # Sparse backend: BM25 walks postings, so build them on first use
+            self.postings[language] = self._postings_from_counts(language)
+        doc_lengths = mapped.doc_lengths if mapped is not None else self.doc_lengths[language]
+        num_docs = self._live_count(language)
+        avg_length = (sum(doc_lengths) / num_docs) if num_docs else 1.0
+        k1, b = self.bm25_k1, self.bm25_b
+        state = self.bm25_states[language] = {
+            'num_docs': num_docs,
+            'length_norms': [k1 * (1 - b + b * length / avg_length) for length in doc_lengths],
+            'idf': {},
+            'bounds': {},
+        }
+        return state
+
+    def _doc_freq(self, language, term):
+        mapped = self.mapped_indices[language]
+        if mapped is not None:
+            term_id = mapped.term_id(term)
+            return 0 if term_id is None else mapped.doc_freqs[term_id]
+        return self.doc_freqs[language].get(term, 0)
+
+    def _bm25_idf(self, language, state, term):
+        idf = state['idf'].get(term)
+        if idf is None:
+            df = self._doc_freq(language, term)
+            idf = state['idf'][term] = math.log(1 + (state['num_docs'] - df + 0.5) / (df + 0.5)) if df else 0.0
+        return idf
+
+    def _bm25_bound(self, language, state, term):
+        """Largest BM25 contribution of one occurrence of term in the query, over all documents"""
+        bound = state['bounds'].get(term)
+        if bound is None:
+            idf = self._bm25_idf(language, state, term)
+            norms = state['length_norms']
+            k1 = self.bm25_k1
+            bound = 0.0
+            if idf:
+                for shard in (self.postings[language] or {}).values():
+                    plist = shard.get(term)
+                    if plist:
+                        bound = max(bound, max((tf * (k1 + 1) / (tf + norms[doc_id]) for doc_id, tf in plist),
+                                               default=0.0))
+            bound = state['bounds'][term] = idf * bound
+        return bound
+
+    def _rank_bm25(self, query, language, target_kingdoms, top_k, min_similarity=0.01, prune=True):
+        """
+        Return [(doc_id, bm25 score), ...] for the top_k documents, best first, ordered
+        like _rank_postings. prune=False scores every matching document (for comparisons).
+        """
+        state = self._bm25_state(language)
+        norms = state['length_norms']
+        k1 = self.bm25_k1
+        shards = self._postings_shards(language, target_kingdoms)
+        # Candidates can be probed in the forward index when it holds dicts (O(1) lookups)
+        probe = self.mapped_indices[language] is None and not self._compact(language)
+        forward = self.term_counts[language]
+
+        terms = []
+        for term, qtf in Counter(self._tokenize(query, language)).items():
+            bound = self._bm25_bound(language, state, term) * qtf
+            if bound > 0:
+                terms.append((bound, term, qtf))
+        terms.sort(reverse=True)
+
+        remaining = sum(bound for bound, _, _ in terms)  # upper bound of the terms not yet scored
+        scores = {}
+        admitting = True  # False once no unseen document can reach the top_k
+        for bound, term, qtf in terms:
+            remaining -= bound
+            weight = qtf * self._bm25_idf(language, state, term)
+            if admitting or not probe or len(scores) >= self._doc_freq(language, term):
+                get = scores.get
+                for shard in shards:
+                    plist = shard.get(term)
+                    if not plist:
+                        continue
+                    for doc_id, tf in plist:
+                        score = get(doc_id)
+                        if score is not None:
+                            scores[doc_id] = score + weight * tf * (k1 + 1) / (tf + norms[doc_id])
+                        elif admitting:
+                            scores[doc_id] = weight * tf * (k1 + 1) / (tf + norms[doc_id])
+            else:
+                # Fewer candidates than postings: look their counts up instead
+                for doc_id, score in scores.items():
+                    tf = forward[doc_id].get(term)
+                    if tf:
+                        scores[doc_id] = score + weight * tf * (k1 + 1) / (tf + norms[doc_id])
+
+            if prune and len(scores) >= top_k > 0:
+                threshold = heapq.nlargest(top_k, scores.values())[-1] - self.BM25_PRUNE_MARGIN
+                if remaining < threshold:
+                    admitting = False
+                    if len(scores) > top_k:
+                        scores = {d: sc for d, sc in scores.items() if sc + remaining >= threshold}
+
+        return self._top_k(scores.items(), top_k, min_similarity)
+
+    # ---------------------------------------------------------
+    #  Ranking
+    # ---------------------------------------------------------
+    def _rank_documents(self, query_vec, language, target_kingdoms, top_k, min_similarity=0.01):
+        """
+        Return [(doc_id, similarity), ...] for the top_k documents, best first.
+        Ties on the rounded similarity keep corpus order.
+        """
+        return self._rank_many([query_vec], language, target_kingdoms, top_k, min_similarity)[0]
+
+    def _rank_many(self, query_vecs, language, target_kingdoms, top_k, min_similarity=0.01):
+        """
+        Rank several query vectors at once; the sparse backend scores them as one
+        query-matrix x doc-matrix product
+        """
+        if self.backend == 'sparse' and self.mapped_indices[language] is None:
+            index = self.sparse_indices[language]
+            mask = index.kingdom_mask(target_kingdoms)
+            if len(query_vecs) == 1:
+                score_rows = [index.score(query_vecs[0])]
+            else:
+                score_rows = index.score_many(query_vecs)
+            return [index.top_k(row, top_k, mask, min_similarity) for row in score_rows]
+
+        return [self._rank_postings(qv, language, target_kingdoms, top_k, min_similarity)
+                for qv in query_vecs]
+
+    def _rank_postings(self, query_vec, language, target_kingdoms, top_k, min_similarity):
+        # Term-at-a-time scoring: only documents sharing a query term are touched
+        scores = self._score_postings(query_vec, language, target_kingdoms)
+        query_norm = self._vector_norm(query_vec)
+        doc_norms = self.doc_norms[language]
+        if query_norm == 0:
+            return []
+
+        similarities = ((doc_id, dot / (query_norm * doc_norms[doc_id]))
+                        for doc_id, dot in scores.items() if doc_norms[doc_id])
+        return self._top_k(similarities, top_k, min_similarity)
+
+    @staticmethod
+    def _top_k(scored, top_k, min_similarity):
+        """
+        The best top_k of (doc_id, score) pairs scoring above min_similarity, best first:
+        by score rounded to 4 decimals, descending, then by doc_id. Selected with a
+        size-top_k heap, so the candidates are never sorted as a whole.
+        """
+        if top_k <= 0:
+            return []
+        heap = []  # (rounded score, -doc_id, score); heap[0] is the worst kept
+        for doc_id, score in scored:
+            if score <= min_similarity:
+                continue
+            entry = (round(score, 4), -doc_id, score)
+            if len(heap) < top_k:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+        heap.sort(reverse=True)
+        return [(-neg_doc_id, score) for _, neg_doc_id, score in heap]
+
+    def _count_candidates(self, language, target_kingdoms):
+        if not target_kingdoms:
+            return self._live_count(language)
+        if self.mapped_indices[language] is not None:
+            counts = self.mapped_indices[language].kingdom_counts
+            return sum(counts.get(k, 0) for k in set(target_kingdoms))
+        shards = self.kingdom_doc_ids[language]
+        return sum(len(shards.get(k, ())) for k in set(target_kingdoms))
+
+    def _make_result(self, doc, doc_id, sim):
+        return {
+            'text': doc['text'],
+            'kingdom': doc['kingdom_label'],
+            'language': doc['language'],
+            'paragraph_id': doc.get('paragraph_id', doc_id),
+            'similarity': round(sim, 4)
+        }
+
     # ---------------------------------------------------------
     #  Search Logic
     # ---------------------------------------------------------
-    def search(self, query, language, target_kingdoms=None, top_k=5):
-        if not self.tfidf_matrices[language]:
+    def _check_scoring(self, scoring):
+        if scoring not in self.SCORING:
+            raise ValueError(f"scoring must be one of {self.SCORING}")
+
+    def search(self, query, language, target_kingdoms=None, top_k=5, scoring='cosine', min_similarity=0.01):
+        """
+        Top_k paragraphs of `language` for query, optionally restricted to target_kingdoms.
+        scoring='cosine' ranks by TF-IDF cosine similarity, 'bm25' by BM25 score; either
+        way the score is reported as 'similarity', and only paragraphs scoring above
+        min_similarity are returned.
+        """
+        self._check_scoring(scoring)
+        if not self.paragraph_metadata[language]:
             return {'paragraphs': [], 'query': query, 'language': language}
 
-        cache_key = self._generate_cache_key(query, language, target_kingdoms, top_k)
-        cached = self._get_from_cache(cache_key)
-        if cached:
-            cached['from_cache'] = True
-            return cached
+        cache_key = self._generate_cache_key(query, language, target_kingdoms, top_k, scoring, min_similarity)
+        cached = self.query_cache.get(cache_key)
+        if cached is not None:
+            return self._make_result_data(query, language, target_kingdoms, cached, from_cache=True)
 
         try:
-            query_vec = self._vectorize_query(query, language)
-            candidates = self.paragraph_metadata[language]
-
-            # Filter by kingdoms if needed
-            if target_kingdoms:
-                candidates = [c for c in candidates if c['kingdom_label'] in target_kingdoms]
-                tfidf_docs = [self.tfidf_matrices[language][i]
-                              for i, c in enumerate(self.paragraph_metadata[language])
-                              if c['kingdom_label'] in target_kingdoms]
+            self._ensure_fresh(language)
+            if scoring == 'bm25':
+                ranked = self._rank_bm25(query, language, target_kingdoms, top_k, min_similarity)
             else:
-                tfidf_docs = self.tfidf_matrices[language]
-
-            # Compute similarities
-            results = []
-            for idx, doc_vec in enumerate(tfidf_docs):
-                sim = self._cosine_similarity(query_vec, doc_vec)
-                if sim > 0.01:
-                    results.append({
-                        'text': candidates[idx]['text'],
-                        'kingdom': candidates[idx]['kingdom_label'],
-                        'language': candidates[idx]['language'],
-                        'paragraph_id': candidates[idx].get('paragraph_id', idx),
-                        'similarity': round(sim, 4)
-                    })
-
-            # Sort by similarity
-            results.sort(key=lambda x: x['similarity'], reverse=True)
-            result_data = {
-                'paragraphs': results[:top_k],
-                'query': query,
-                'language': language,
-                'target_kingdoms': target_kingdoms,
-                'total_candidates': len(candidates),
-                'from_cache': False
-            }
-
-            self._add_to_cache(cache_key, result_data)
-            return result_data
+                query_vec = self._vectorize_query(query, language)
+                ranked = self._rank_documents(query_vec, language, target_kingdoms, top_k, min_similarity)
+            entry = self.query_cache.put(cache_key, ranked, self._count_candidates(language, target_kingdoms))
+            return self._make_result_data(query, language, target_kingdoms, entry)
 
         except Exception as e:
             print(f"Search error: {e}")
             return {'paragraphs': [], 'query': query, 'language': language}
 
+    def search_many(self, queries, language, target_kingdoms=None, top_k=5, scoring='cosine',
+                    min_similarity=0.01):
+        """
+        Batch version of search: returns one result dict per query, in input order.
+        Shares the query cache with search; only cache misses are vectorized and
+        scored, together, in chunks of SEARCH_MANY_CHUNK queries.
+        """
+        self._check_scoring(scoring)
+        queries = list(queries)
+        if not self.paragraph_metadata[language]:
+            return [{'paragraphs': [], 'query': q, 'language': language} for q in queries]
+
+        results = [None] * len(queries)
+        pending = defaultdict(list)  # cache key -> positions of queries still to score
+        pending_queries = {}
+        for pos, query in enumerate(queries):
+            cache_key = self._generate_cache_key(query, language, target_kingdoms, top_k, scoring,
+                                                 min_similarity)
+            if cache_key in pending:
+                pending[cache_key].append(pos)
+                continue
+            cached = self.query_cache.get(cache_key)
+            if cached is not None:
+                results[pos] = self._make_result_data(query, language, target_kingdoms, cached, from_cache=True)
+            else:
+                pending[cache_key].append(pos)
+                pending_queries[cache_key] = query
+
+        if pending_queries:
+            try:
+                self._ensure_fresh(language)
+                total_candidates = self._count_candidates(language, target_kingdoms)
+                keys = list(pending_queries)
+                for start in range(0, len(keys), self.SEARCH_MANY_CHUNK):
+                    chunk = keys[start:start + self.SEARCH_MANY_CHUNK]
+                    if scoring == 'bm25':
+                        ranked_lists = [self._rank_bm25(pending_queries[k], language, target_kingdoms, top_k,
+                                                        min_similarity)
+                                        for k in chunk]
+                    else:
+                        query_vecs = [self._vectorize_query(pending_queries[k], language) for k in chunk]
+                        ranked_lists = self._rank_many(query_vecs, language, target_kingdoms, top_k,
+                                                       min_similarity)
+                    for cache_key, ranked in zip(chunk, ranked_lists):
+                        entry = self.query_cache.put(cache_key, ranked, total_candidates)
+                        for pos in pending[cache_key]:
+                            results[pos] = self._make_result_data(queries[pos], language, target_kingdoms, entry)
+            except Exception as e:
+                print(f"Search error: {e}")
+                for pos, result in enumerate(results):
+                    if result is None:
+                        results[pos] = {'paragraphs': [], 'query': queries[pos], 'language': language}
+
+        return results
+
+    def _make_result_data(self, query, language, target_kingdoms, entry, from_cache=False):
+        """A new result dict for a CachedResult, with the paragraphs resolved from the metadata"""
+        metadata = self.paragraph_metadata[language]
+        return {
+            'paragraphs': [self._make_result(metadata[doc_id], doc_id, sim) for doc_id, sim in entry.ranked],
+            'query': query,
+            'language': language,
+            'target_kingdoms': target_kingdoms,
+            'total_candidates': entry.total_candidates,
+            'from_cache': from_cache
+        }
+
     # ---------------------------------------------------------
     #  Save / Load index
     # ---------------------------------------------------------
-    def save_index(self, filepath):
+    INDEX_VERSION = 2
+    INDEX_FORMATS = ('mmap', 'pickle')
+
+    def save_index(self, filepath, format='mmap'):
+        """
+        Save the index. 'mmap' writes the binary format that load_index maps in place;
+        'pickle' writes the legacy pickle (kept for tooling and comparisons).
+        """
+        if format not in self.INDEX_FORMATS:
+            raise ValueError(f"format must be one of {self.INDEX_FORMATS}")
+        self._materialize_all()
+        if format == 'mmap':
+            write_index(self, filepath)
+            return
+
+        # Compact languages are saved as plain dicts; their postings are rebuilt on load
         data = {
-            'vectorizers': self.vectorizers,
-            'tfidf_matrices': self.tfidf_matrices,
-            'paragraph_metadata': self.paragraph_metadata
+            'index_version': self.INDEX_VERSION,
+            'te_features': self.te_features,
+            'paragraph_metadata': self.paragraph_metadata,
+            'term_counts': {lang: [dict(c.items()) if c is not None else None for c in counts]
+                            if self._compact(lang) else counts
+                            for lang, counts in self.term_counts.items()},
+            'doc_lengths': self.doc_lengths,
+            'doc_freqs': self.doc_freqs,
+            'postings': {lang: None if self._compact(lang) else postings
+                         for lang, postings in self.postings.items()}
         }
         with open(filepath, 'wb') as f:
             pickle.dump(data, f)
@@ -237,12 +878,127 @@ class RetrievalSystem:
     def load_index(self, filepath):
         if not os.path.exists(filepath):
             return False
+        if is_index_file(filepath):
+            self._load_mapped_index(filepath)
+        else:
+            self._load_pickle_index(filepath)
+        self._invalidate_cache()
+        return True
+
+    def _load_mapped_index(self, filepath):
+        index_file = MappedIndexFile(filepath)
+        self.mapped_path = filepath
+        # Queries must be tokenized like the saved paragraphs
+        self.te_features = index_file.te_features
+        for lang in ['en', 'te']:
+            self._reset_language(lang)
+            mapped = index_file.languages.get(lang)
+            if mapped is None or not mapped.num_docs:
+                continue
+            self._attach_mapped(lang, mapped)
+            self._stale[lang] = False
+        # Mapped documents join corpus_data only when their language is materialized
+        self.corpus_data = []
+
+    # The attributes holding views of a mapped language
+    MAPPED_ATTRIBUTES = ('mapped_indices', 'paragraph_metadata', 'postings', 'doc_norms', 'vectorizers')
+
+    def _attach_mapped(self, language, mapped):
+        # The mapped views stand in for the in-memory structures used by search
+        self.mapped_indices[language] = mapped
+        self.paragraph_metadata[language] = mapped.documents
+        self.postings[language] = mapped.shards
+        self.doc_norms[language] = mapped.doc_norms
+        self.vectorizers[language] = {'idf': mapped.idf}
+
+    def __getstate__(self):
+        # Memoryviews cannot be pickled: mapped languages are stored as the file's path
+        state = self.__dict__.copy()
+        mapped = [lang for lang, index in self.mapped_indices.items() if index is not None]
+        for name in self.MAPPED_ATTRIBUTES:
+            state[name] = {lang: None if lang in mapped else value for lang, value in state[name].items()}
+        state['_mapped_languages'] = mapped
+        return state
+
+    def __setstate__(self, state):
+        mapped = state.pop('_mapped_languages', ())
+        self.__dict__.update(state)
+        if mapped:
+            index_file = MappedIndexFile(self.mapped_path)
+            for lang in mapped:
+                self._attach_mapped(lang, index_file.languages[lang])
+
+    def _materialize(self, language):
+        """Copy a memory-mapped language into the mutable in-memory index"""
+        mapped = self.mapped_indices[language]
+        if mapped is None:
+            return
+        documents = list(mapped.documents)
+        term_counts = mapped.term_counts()
+        self._reset_language(language)
+        if self._compact(language):
+            term_counts = [self.feature_tables[language].counts(counts) for counts in term_counts]
+        self.paragraph_metadata[language] = documents
+        self.term_counts[language] = term_counts
+        self.doc_lengths[language] = list(mapped.doc_lengths)
+        for term_id in range(mapped.num_terms):
+            self.doc_freqs[language][mapped.terms[term_id]] = mapped.doc_freqs[term_id]
+        for doc_id, item in enumerate(documents):
+            self.kingdom_doc_ids[language].setdefault(item['kingdom_label'], set()).add(doc_id)
+            self.paragraph_locations[language].setdefault(item.get('paragraph_id'), []).append(doc_id)
+        if self.backend == 'python' and not self._compact(language):
+            self.postings[language] = self._postings_from_counts(language)
+        self._refresh_weights(language)
+        self.corpus_data.extend(documents)
+
+    def _materialize_all(self):
+        for lang in ['en', 'te']:
+            self._materialize(lang)
+
+    def _load_pickle_index(self, filepath):
         with open(filepath, 'rb') as f:
             data = pickle.load(f)
-            self.vectorizers = data['vectorizers']
-            self.tfidf_matrices = data['tfidf_matrices']
-            self.paragraph_metadata = data['paragraph_metadata']
-        return True
+        self.te_features = data.get('te_features', 'char')
+
+        for lang in ['en', 'te']:
+            if data.get('index_version', 1) < 2:
+                # Old indexes stored idf-weighted vectors only; re-tokenize the paragraphs
+                self._build_language_index(data['paragraph_metadata'][lang] or [], lang)
+                continue
+            self._reset_language(lang)
+            self.paragraph_metadata[lang] = data['paragraph_metadata'][lang]
+            self.term_counts[lang] = data['term_counts'][lang]
+            if self._compact(lang):
+                table = self.feature_tables[lang]
+                self.term_counts[lang] = [table.counts(counts) if counts else None
+                                          for counts in self.term_counts[lang]]
+            self.doc_lengths[lang] = data['doc_lengths'][lang]
+            self.doc_freqs[lang] = data['doc_freqs'][lang]
+            saved_postings = data['postings'][lang]
+            for doc_id, item in enumerate(self.paragraph_metadata[lang]):
+                if item is None:
+                    continue
+                self.kingdom_doc_ids[lang].setdefault(item['kingdom_label'], set()).add(doc_id)
+                self.paragraph_locations[lang].setdefault(item.get('paragraph_id'), []).append(doc_id)
+            if self.backend == 'python' and not self._compact(lang):
+                self.postings[lang] = saved_postings if saved_postings is not None else self._postings_from_counts(lang)
+            self._refresh_weights(lang)
+
+        self.corpus_data = [d for lang in ['en', 'te'] for d in self.paragraph_metadata[lang] if d]
+
+    def _postings_from_counts(self, language):
+        if self._compact(language):
+            return build_compact_postings(
+                self.feature_tables[language], self.term_counts[language],
+                [doc['kingdom_label'] if doc else None for doc in self.paragraph_metadata[language]])
+        postings = {}
+        for doc_id, counts in enumerate(self.term_counts[language]):
+            if not counts:
+                continue
+            shard = postings.setdefault(self.paragraph_metadata[language][doc_id]['kingdom_label'], {})
+            for term, count in counts.items():
+                shard.setdefault(term, []).append((doc_id, count))
+        return postings
 
     # ---------------------------------------------------------
     #  Stats and utilities
@@ -250,17 +1006,80 @@ class RetrievalSystem:
     def get_index_stats(self):
         stats = {}
         for lang in ['en', 'te']:
-            tfidf = self.tfidf_matrices[lang]
+            mapped = self.mapped_indices[lang]
+            if mapped is not None:
+                stats[lang] = {
+                    'num_paragraphs': mapped.num_docs,
+                    'num_features': mapped.num_terms,
+                    'kingdoms': list(mapped.kingdoms)
+                }
+                continue
             stats[lang] = {
-                'num_paragraphs': len(tfidf) if tfidf else 0,
-                'num_features': len(self.vectorizers[lang]['idf']) if self.vectorizers[lang] else 0,
-                'kingdoms': list(set(d['kingdom_label'] for d in self.paragraph_metadata[lang]))
+                'num_paragraphs': self._live_count(lang),
+                'num_features': len(self.doc_freqs[lang]),
+                'kingdoms': [k for k, ids in self.kingdom_doc_ids[lang].items() if ids]
             }
         return stats
 
+    # ---------------------------------------------------------
+    #  Incremental updates
+    # ---------------------------------------------------------
     def add_documents(self, new_docs):
+        """Index new paragraphs without rebuilding the existing index"""
+        # corpus_data must hold every indexed paragraph, in doc id order, before the new ones
+        self._materialize_all()
         self.corpus_data.extend(new_docs)
-        self.build_index()
+        for lang in ['en', 'te']:
+            batch = [d for d in new_docs if d['language'] == lang]
+            self._index_documents(batch, lang)
+        self._invalidate_cache()
+
+    def delete_documents(self, paragraph_ids):
+        """Remove every indexed paragraph carrying one of paragraph_ids. Returns the number removed."""
+        self._materialize_all()
+        removed = []
+        for pid in set(paragraph_ids):
+            for lang in ['en', 'te']:
+                for doc_id in list(self.paragraph_locations[lang].get(pid, [])):
+                    removed.append(self._remove_document(lang, doc_id))
+        self._drop_from_corpus(removed)
+        if removed:
+            self._invalidate_cache()
+        return len(removed)
+
+    def replace_document(self, paragraph_id, new_doc):
+        """
+        Replace the paragraph(s) carrying paragraph_id with new_doc. The first match in
+        new_doc's language keeps its doc_id (and so its position for tie-breaking);
+        if there is none, new_doc is appended.
+        """
+        self._materialize_all()
+        language = new_doc['language']
+        slots = self.paragraph_locations[language].get(paragraph_id)
+        if not slots:
+            self.delete_documents([paragraph_id])
+            self.add_documents([new_doc])
+            return
+
+        keep = slots[0]
+        old_doc = self._remove_document(language, keep)
+        self.delete_documents([paragraph_id])  # any further duplicates
+        self._index_document(new_doc, language, keep)
+        self._stale[language] = True
+
+        for pos, doc in enumerate(self.corpus_data):
+            if doc is old_doc:
+                self.corpus_data[pos] = new_doc
+                break
+        else:
+            self.corpus_data.append(new_doc)
+        self._invalidate_cache()
+
+    def _drop_from_corpus(self, docs):
+        if not docs:
+            return
+        drop = set(id(d) for d in docs)
+        self.corpus_data = [d for d in self.corpus_data if id(d) not in drop]
 
     def search_cross_language(self, query, query_language, top_k=5):
         results_same = self.search(query, query_language, top_k=top_k//2)
@@ -0,0 +1,175 @@
+"""
+Optional NumPy/SciPy backend for RetrievalSystem.
+
+Terms get integer ids and the raw term counts are stored as one float32
+term-major CSR matrix (row = term, columns = documents), so scoring a query
+is a weighted sum of its terms' rows, a batch of queries is a single sparse
+mat-mat product, and top-k uses argpartition. IDF weights and document norms
+are kept as vectors beside the counts and applied at scoring time: updating
+documents patches their columns, and reweighting after an update is a few
+vector operations over the matrix.
+"""
+
+try:
+    import numpy as np
+    import scipy.sparse as sp
+except ImportError:  # numpy/scipy are optional
+    np = None
+    sp = None
+
+
+def sparse_backend_available():
+    return np is not None and sp is not None
+
+
+class SparseTfidfIndex:
+    """
+    CSR term-count matrix built from RetrievalSystem's {term: count} dicts (one per
+    doc id, empty or None for deleted documents). update() replaces documents;
+    reweight() must follow before scoring.
+    """
+
+    def __init__(self, count_vectors, labels=None):
+        if not sparse_backend_available():
+            raise ImportError("The sparse backend requires numpy and scipy")
+
+        self.term_ids = {}
+        self.num_docs = 0
+        self.matrix = sp.csr_matrix((0, 0), dtype=np.float32)
+        self.labels = np.empty(0, dtype=object)
+        # label (kingdom) -> boolean document mask
+        self.label_masks = {}
+        self.idf = np.empty(0)
+        self.inv_norms = np.empty(0)
+        count_vectors = dict(enumerate(count_vectors))
+        self.update(count_vectors, dict.fromkeys(count_vectors) if labels is None else dict(enumerate(labels)))
+
+    def update(self, count_vectors, labels):
+        """
+        Replace the columns of the documents in count_vectors ({doc_id: {term: count}})
+        and their labels ({doc_id: label}); doc ids past the end grow the matrix.
+        Only the changed columns are rewritten.
+        """
+        rows, cols, data = [], [], []
+        for doc_id, vec in count_vectors.items():
+            for term, count in (vec or {}).items():
+                rows.append(self.term_ids.setdefault(term, len(self.term_ids)))
+                cols.append(doc_id)
+                data.append(count)
+        doc_ids = np.fromiter(count_vectors, dtype=np.int64, count=len(count_vectors))
+        num_docs = max(self.num_docs, int(doc_ids.max()) + 1) if doc_ids.size else self.num_docs
+        shape = (len(self.term_ids), num_docs)
+
+        matrix = self.matrix
+        replaced = doc_ids[doc_ids < self.num_docs]
+        if replaced.size:
+            matrix.data[np.isin(matrix.indices, replaced)] = 0
+        matrix.resize(shape)
+        patch = sp.csr_matrix((np.asarray(data, dtype=np.float32), (rows, cols)), shape=shape)
+        self.matrix = matrix + patch
+        # Row lengths are the document frequencies (see reweight)
+        self.matrix.eliminate_zeros()
+
+        if num_docs > self.num_docs:
+            grow = num_docs - self.num_docs
+            self.labels = np.concatenate([self.labels, np.full(grow, None, dtype=object)])
+            self.label_masks = {label: np.concatenate([mask, np.zeros(grow, dtype=bool)])
+                                for label, mask in self.label_masks.items()}
+            self.num_docs = num_docs
+        for doc_id, label in labels.items():
+            old = self.labels[doc_id]
+            if old is not None:
+                self.label_masks[old][doc_id] = False
+            self.labels[doc_id] = label
+            if label is not None:
+                mask = self.label_masks.get(label)
+                if mask is None:
+                    mask = self.label_masks[label] = np.zeros(num_docs, dtype=bool)
+                mask[doc_id] = True
+
+    def reweight(self, num_docs):
+        """
+        Recompute the IDF of every term from the matrix, num_docs being the live document
+        count, and the document norms (L2 norm of count * idf) from the IDF.
+        """
+        doc_freqs = np.diff(self.matrix.indptr)
+        self.idf = np.log((1 + num_docs) / (1 + doc_freqs)) + 1
+        norms = np.sqrt(self.matrix.power(2).T @ (self.idf * self.idf))
+        self.inv_norms = np.zeros_like(norms)
+        nonzero = norms > 0
+        self.inv_norms[nonzero] = 1.0 / norms[nonzero]
+
+    def kingdom_mask(self, labels):
+        """Boolean mask of documents carrying any of the labels, or None for no filter"""
+        if not labels:
+            return None
+        masks = [self.label_masks[l] for l in set(labels) if l in self.label_masks]
+        if not masks:
+            return np.zeros(self.num_docs, dtype=bool)
+        if len(masks) == 1:
+            return masks[0]
+        return np.logical_or.reduce(masks)
+
+    def _query_weights(self, query_vec):
+        """Term ids and L2-normalized weights of a query TF-IDF dict; unknown terms are dropped"""
+        ids = []
+        weights = []
+        for term, weight in query_vec.items():
+            term_id = self.term_ids.get(term)
+            if term_id is not None and weight:
+                ids.append(term_id)
+                weights.append(weight)
+        w = np.asarray(weights, dtype=np.float64)
+        if ids:
+            w /= np.sqrt(w @ w)
+        return ids, w
+
+    def query_matrix(self, query_vecs):
+        """Normalized queries times the IDF, one row per query, for scoring against the counts"""
+        indptr = [0]
+        indices = []
+        data = []
+        for vec in query_vecs:
+            ids, w = self._query_weights(vec)
+            indices.extend(ids)
+            data.append(w * self.idf[ids])
+            indptr.append(len(indices))
+        data = np.concatenate(data) if data else np.empty(0)
+        return sp.csr_matrix((data, indices, indptr), shape=(len(query_vecs), len(self.term_ids)))
+
+    def score_many(self, query_vecs):
+        """Cosine similarity of every query against every document, shape (queries, docs)"""
+        queries = self.query_matrix(query_vecs)
+        return (queries @ self.matrix).toarray() * self.inv_norms
+
+    def score(self, query_vec):
+        """Cosine similarity of one query against every document"""
+        ids, w = self._query_weights(query_vec)
+        if not ids:
+            return np.zeros(self.num_docs)
+        return (self.matrix[ids].T @ (w * self.idf[ids])) * self.inv_norms
+
+    def top_k(self, scores, top_k, mask=None, min_score=0.01):
+        """
+        Return [(doc_id, score), ...] for the best top_k documents, ordered like the
+        pure-Python path: by 4-decimal similarity descending, then doc id ascending.
+        """
+        if mask is not None:
+            scores = np.where(mask, scores, 0.0)
+        eligible = np.flatnonzero(scores > min_score)
+        if eligible.size == 0 or top_k <= 0:
+            return []
+
+        if eligible.size > top_k:
+            part = np.argpartition(-scores[eligible], top_k - 1)[:top_k]
+            # Keep every document tied (after rounding) with the k-th best
+            cutoff = np.round(scores[eligible[part]].min(), 4)
+            eligible = eligible[np.round(scores[eligible], 4) >= cutoff]
+
+        ranked = sorted(((int(i), float(scores[i])) for i in eligible),
+                        key=lambda x: (-round(x[1], 4), x[0]))
+        return ranked[:top_k]
+
+    def memory_bytes(self):
+        m = self.matrix
+        return m.data.nbytes + m.indices.nbytes + m.indptr.nbytes + self.idf.nbytes + self.inv_norms.nbytes
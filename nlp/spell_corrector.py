@@ -1,10 +1,13 @@
 import re
-from collections import Counter, defaultdict
+from collections import Counter, OrderedDict, defaultdict
+
+from nlp.edit_distance import edit_distance
+from nlp.vocab_trie import VocabularyTrie
 
 class SpellCorrector:
     """Spelling error detection and correction using edit distance"""
     
-    def __init__(self):
+    def __init__(self, cache_size=1000):
         # English dictionary with frequencies (simplified)
         self.english_dict = self._build_english_dictionary()
         
@@ -13,6 +16,15 @@ class SpellCorrector:
         
         # Protected words (kingdom names, etc.)
         self.protected_words = set()
+
+        # language -> VocabularyTrie, built on first correction
+        self._tries = {}
+
+        # LRU memo of correct_word: (language, word) -> correction
+        self.cache_size = cache_size
+        self.correction_cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
     
     def _build_english_dictionary(self):
         """Build English dictionary with word frequencies"""
@@ -66,6 +78,28 @@ class SpellCorrector:
     def add_protected_words(self, words):
         """Add words that should not be corrected (e.g., kingdom names)"""
         self.protected_words.update(words)
+        self._invalidate_cache()
+
+    def reload_vocabulary(self):
+        """Rebuild the dictionaries, dropping tries and memoized corrections built from the old ones"""
+        self.english_dict = self._build_english_dictionary()
+        self.telugu_dict = self._build_telugu_dictionary()
+        self._tries.clear()
+        self._invalidate_cache()
+
+    def _invalidate_cache(self):
+        self.correction_cache.clear()
+
+    def get_cache_stats(self):
+        total = self.cache_hits + self.cache_misses
+        hit_rate = (self.cache_hits / total * 100) if total else 0
+        return {
+            'cache_size': len(self.correction_cache),
+            'max_cache_size': self.cache_size,
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'hit_rate': hit_rate
+        }
     
     def is_valid_word(self, word, language):
         """Check if word exists in dictionary"""
@@ -74,35 +108,33 @@ class SpellCorrector:
         else:
             return word.lower() in self.english_dict
     
-    def generate_candidates(self, word):
-        """Generate spelling correction candidates using edit distance"""
-        letters = 'abcdefghijklmnopqrstuvwxyz'
-        
-        # Telugu letters for Telugu words
-        if any('\u0C00' <= c <= '\u0C7F' for c in word):
-            telugu_letters = [
-                'అ', 'ఆ', 'ఇ', 'ఈ', 'ఉ', 'ఊ', 'ఋ', 'ఌ', 'ఎ', 'ఏ', 'ఐ', 'ఒ', 'ఓ', 'ఔ',
-                'క', 'ఖ', 'గ', 'ఘ', 'ఙ', 'చ', 'ఛ', 'జ', 'ఝ', 'ఞ', 'ట', 'ఠ', 'డ', 'ఢ', 'ణ',
-                'త', 'థ', 'ద', 'ధ', 'న', 'ప', 'ఫ', 'బ', 'భ', 'మ', 'య', 'ర', 'ల', 'వ',
-                'శ', 'ష', 'స', 'హ', 'ళ'
-            ]
-            letters = telugu_letters
-        
-        splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
-        
-        # Delete one character
-        deletes = [L + R[1:] for L, R in splits if R]
-        
-        # Transpose adjacent characters
-        transposes = [L + R[1] + R[0] + R[2:] for L, R in splits if len(R) > 1]
-        
-        # Replace one character
-        replaces = [L + c + R[1:] for L, R in splits if R for c in letters]
-        
-        # Insert one character
-        inserts = [L + c + R for L, R in splits for c in letters]
-        
-        return set(deletes + transposes + replaces + inserts)
+    def _vocabulary_trie(self, language):
+        """Trie over the language's dictionary, built on first use"""
+        trie = self._tries.get(language)
+        if trie is None:
+            words = self.telugu_dict if language == 'te' else self.english_dict
+            trie = self._tries[language] = VocabularyTrie(words)
+        return trie
+
+    def generate_candidates(self, word, language, max_dist=1):
+        """
+        Dictionary words within max_dist edits (adjacent swaps count as one), most frequent
+        first. English is matched case-insensitively and candidates take the word's casing.
+        """
+        trie = self._vocabulary_trie(language)
+        if language == 'te':
+            return [cand for cand, _, _ in trie.lookup(word, max_dist, transpositions=True)]
+        return [self._match_case(cand, word)
+                for cand, _, _ in trie.lookup(word.lower(), max_dist, transpositions=True)]
+
+    @staticmethod
+    def _match_case(candidate, word):
+        """candidate upper-cased or capitalized like word"""
+        if word.isupper():
+            return candidate.upper()
+        if word[:1].isupper():
+            return candidate[:1].upper() + candidate[1:]
+        return candidate
     
     def get_word_probability(self, word, language):
         """Get word probability from dictionary"""
@@ -124,15 +156,24 @@ class SpellCorrector:
         # Don't correct very short words or numbers
         if len(word) < 3 or word.isdigit():
             return word
-        
-        # Generate candidates
-        candidates = self.generate_candidates(word)
-        
-        # Filter valid candidates
-        if language == 'te':
-            valid_candidates = [c for c in candidates if c in self.telugu_dict]
-        else:
-            valid_candidates = [c for c in candidates if c.lower() in self.english_dict]
+
+        # Out-of-vocabulary words are memoized
+        key = (language, word)
+        if key in self.correction_cache:
+            self.cache_hits += 1
+            self.correction_cache.move_to_end(key)
+            return self.correction_cache[key]
+        self.cache_misses += 1
+
+        corrected = self._best_candidate(word, language)
+        self.correction_cache[key] = corrected
+        if len(self.correction_cache) > self.cache_size:
+            self.correction_cache.popitem(last=False)
+        return corrected
+
+    def _best_candidate(self, word, language):
+        # Dictionary words one edit away
+        valid_candidates = self.generate_candidates(word, language)
         
         if not valid_candidates:
             return word  # No valid corrections found
@@ -140,8 +181,12 @@ class SpellCorrector:
         # Score candidates by probability
         def candidate_score(candidate):
             prob = self.get_word_probability(candidate, language)
-            # Prefer candidates with smaller edit distance (simpler corrections)
-            edit_distance = self._edit_distance(word, candidate)
+            # Prefer candidates with smaller edit distance (simpler corrections);
+            # English candidates only differ from the word's casing where it was edited
+            if language == 'te':
+                edit_distance = self._edit_distance(word, candidate)
+            else:
+                edit_distance = self._edit_distance(word.lower(), candidate.lower())
             penalty = 0.1 ** edit_distance  # Exponential penalty for distance
             return prob * penalty
         
@@ -150,23 +195,7 @@ class SpellCorrector:
     
     def _edit_distance(self, s1, s2):
         """Calculate edit distance between two strings"""
-        if len(s1) < len(s2):
-            return self._edit_distance(s2, s1)
-        
-        if len(s2) == 0:
-            return len(s1)
-        
-        previous_row = list(range(len(s2) + 1))
-        for i, c1 in enumerate(s1):
-            current_row = [i + 1]
-            for j, c2 in enumerate(s2):
-                insertions = previous_row[j + 1] + 1
-                deletions = current_row[j] + 1
-                substitutions = previous_row[j] + (c1 != c2)
-                current_row.append(min(insertions, deletions, substitutions))
-            previous_row = current_row
-        
-        return previous_row[-1]
+        return edit_distance(s1, s2)
     
     def correct_tokens(self, tokens, language):
         """Correct a list of tokens"""
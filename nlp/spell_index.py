@@ -0,0 +1,254 @@
+"""
+Prebuilt, memory-mapped n-gram index for NgramSpellChecker.
+
+`build` serializes the word counts and the uni/bi/tri-gram -> word-id postings
+(sorted u32 arrays) of a word-count JSON into one binary file, using the same
+sectioned container as the retrieval index (nlp/index_store.py). Loading maps
+the file in place, so checker startup does no JSON parsing or set building and
+the pages are shared between worker processes.
+
+Usage (from the project root):
+    python nlp/spell_index.py build            # all languages
+    python nlp/spell_index.py build --lang te
+"""
+
+import argparse
+import json
+import os
+import pathlib
+import sys
+from array import array
+
+if __name__ == '__main__':
+    # Ensure project root is on sys.path so we can import local packages when run as a script
+    PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+    if str(PROJECT_ROOT) not in sys.path:
+        sys.path.insert(0, str(PROJECT_ROOT))
+
+from nlp.index_store import MappedStrings, is_index_file, map_sections, pack_strings, write_sections
+
+MAGIC = b'WKSPL\x00\r\n'
+FORMAT_VERSION = 1
+NGRAM_SIZES = (1, 2, 3)
+
+
+def artifact_path(json_file):
+    """Where the prebuilt index for a word-count JSON lives"""
+    return os.path.splitext(json_file)[0] + '.spellidx'
+
+
+def source_signature(json_file):
+    """Cheap staleness check for the source JSON: size and mtime"""
+    st = os.stat(json_file)
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+
+def generate_ngrams(word, n):
+    return [word[i:i+n] for i in range(len(word) - n + 1)]
+
+
+def build_spell_index(json_file, output_path=None):
+    """Build the binary n-gram index for a word-count JSON. Returns the output path."""
+    output_path = output_path or artifact_path(json_file)
+    with open(json_file, "r", encoding="utf-8") as f:
+        word_counts = json.load(f)
+
+    words = sorted(word_counts, key=lambda w: w.encode('utf-8'))
+    sections = {}
+    sections['word_blob'], sections['word_offsets'] = pack_strings(words)
+    sections['word_counts'] = (array('Q', (word_counts[w] for w in words)).tobytes(), 'Q')
+
+    for n in NGRAM_SIZES:
+        postings = {}
+        for word_id, word in enumerate(words):
+            for gram in set(generate_ngrams(word, n)):
+                postings.setdefault(gram, []).append(word_id)  # word ids ascending
+        grams = sorted(postings, key=lambda g: g.encode('utf-8'))
+        offsets = array('Q', [0])
+        ids = array('I')
+        for gram in grams:
+            ids.extend(postings[gram])
+            offsets.append(len(ids))
+        sections[f'{n}/gram_blob'], sections[f'{n}/gram_offsets'] = pack_strings(grams)
+        sections[f'{n}/posting_offsets'] = (offsets.tobytes(), 'Q')
+        sections[f'{n}/posting_ids'] = (ids.tobytes(), 'I')
+
+    header = {
+        'num_words': len(words),
+        'max_word_count': max(word_counts.values()) if word_counts else 0,
+        'source': source_signature(json_file),
+    }
+    write_sections(output_path, MAGIC, FORMAT_VERSION, header, sections)
+    return output_path
+
+
+def load_spell_index(json_file):
+    """Map the prebuilt index for json_file, or return None if it is missing or stale"""
+    path = artifact_path(json_file)
+    if not is_index_file(path, MAGIC):
+        return None
+    try:
+        index = MappedSpellIndex(path)
+    except ValueError:
+        return None
+    try:
+        if index.source != source_signature(json_file):
+            return None
+    except OSError:
+        pass  # JSON not shipped alongside the artifact; trust the artifact
+    return index
+
+
+def _mapped_part(index, n=None):
+    """index.word_counts, or index.ngram_maps[n]; how the mapped views are unpickled"""
+    return index.word_counts if n is None else index.ngram_maps[n]
+
+
+class MappedSpellIndex:
+    """
+    Word counts and n-gram maps read in place from a .spellidx file. The index and
+    its views pickle as the file's path and are mapped again when unpickled.
+    """
+
+    def __init__(self, filepath):
+        self.filepath = str(filepath)
+        header, arrays = map_sections(filepath, MAGIC, FORMAT_VERSION)
+        self.source = header['source']
+        self.max_word_count = header['max_word_count']
+        self.words = MappedWords(arrays['word_blob'], arrays['word_offsets'])
+        self.word_counts = MappedWordCounts(self.words, arrays['word_counts'])
+        self.ngram_maps = {
+            n: MappedNgramMap(self.words,
+                              MappedStrings(arrays[f'{n}/gram_blob'], arrays[f'{n}/gram_offsets']),
+                              arrays[f'{n}/posting_offsets'],
+                              arrays[f'{n}/posting_ids'])
+            for n in NGRAM_SIZES
+        }
+        self.word_counts.index = self
+        for n, ngram_map in self.ngram_maps.items():
+            ngram_map.index = (self, n)
+
+    def __reduce__(self):
+        return MappedSpellIndex, (self.filepath,)
+
+
+class MappedWords(MappedStrings):
+    """Sorted vocabulary; decoded words are memoized since candidates repeat"""
+
+    def __init__(self, blob, offsets):
+        super().__init__(blob, offsets)
+        self._decoded = [None] * len(self)
+
+    def __getitem__(self, word_id):
+        word = self._decoded[word_id]
+        if word is None:
+            word = self._decoded[word_id] = super().__getitem__(word_id)
+        return word
+
+
+class MappedWordCounts:
+    """
+    Read-only dict-like word -> count. Found words are memoized (at most the
+    vocabulary); misses are not, since every unseen query token would add one.
+    """
+
+    def __init__(self, words, counts):
+        self.words = words
+        self.counts = counts
+        self._lookups = {}
+        self.index = None  # the owning MappedSpellIndex
+
+    def __reduce__(self):
+        return _mapped_part, (self.index,)
+
+    def get(self, word, default=None):
+        count = self._lookups.get(word)
+        if count is None:
+            word_id = self.words.find(word)
+            if word_id is None:
+                return default
+            count = self._lookups[word] = self.counts[word_id]
+        return count
+
+    def __getitem__(self, word):
+        count = self.get(word)
+        if count is None:
+            raise KeyError(word)
+        return count
+
+    def __contains__(self, word):
+        return self.get(word) is not None
+
+    def __len__(self):
+        return len(self.words)
+
+    def __iter__(self):
+        return (self.words[i] for i in range(len(self.words)))
+
+    def keys(self):
+        return iter(self)
+
+    def values(self):
+        return iter(self.counts)
+
+    def items(self):
+        return ((self.words[i], self.counts[i]) for i in range(len(self.words)))
+
+
+class MappedNgramMap:
+    """Read-only n-gram -> words map; get() returns the words sharing the n-gram"""
+
+    def __init__(self, words, grams, offsets, ids):
+        self.words = words
+        self.grams = grams
+        self.offsets = offsets
+        self.ids = ids
+        self.index = None  # (owning MappedSpellIndex, n)
+
+    def __reduce__(self):
+        return _mapped_part, self.index
+
+    def word_ids(self, gram):
+        gram_id = self.grams.find(gram)
+        if gram_id is None:
+            return self.ids[0:0]
+        return self.ids[self.offsets[gram_id]:self.offsets[gram_id + 1]]
+
+    def get(self, gram, default=None):
+        ids = self.word_ids(gram)
+        if not len(ids):
+            return default
+        words = self.words
+        return [words[i] for i in ids]
+
+    def __getitem__(self, gram):
+        return self.get(gram, [])
+
+    def __contains__(self, gram):
+        return self.grams.find(gram) is not None
+
+    def __len__(self):
+        return len(self.grams)
+
+
+def main(argv=None):
+    from nlp.bigram import JSON_FILES
+
+    parser = argparse.ArgumentParser(description='Build prebuilt spell-checker n-gram indexes')
+    sub = parser.add_subparsers(dest='command', required=True)
+    build = sub.add_parser('build', help='Build .spellidx files from the word-count JSONs')
+    build.add_argument('--lang', '-l', choices=sorted(JSON_FILES), help='Only build this language')
+
+    args = parser.parse_args(argv)
+    languages = [args.lang] if args.lang else sorted(JSON_FILES)
+    for language in languages:
+        json_file = JSON_FILES[language]
+        if not os.path.exists(json_file):
+            print(f"Input file not found: {json_file}")
+            continue
+        output = build_spell_index(json_file)
+        print(f"Wrote {language} spell index to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Symmetric-deletion (SymSpell) candidate generator for NgramSpellChecker.
+
+Every vocabulary word is indexed under all strings obtained by deleting up to
+`max_distance` characters from it. Two words within Levenshtein distance d
+always share such a deletion variant (a substitution is a deletion on both
+sides), so a lookup only has to probe the misspelling's own deletion variants
+and verify the few words found there -- instead of scanning every word that
+shares an n-gram with it.
+"""
+
+
+def deletion_variants(word, max_distance):
+    """The word plus every string reachable by deleting up to max_distance characters"""
+    variants = {word}
+    frontier = [word]
+    for _ in range(max_distance):
+        next_frontier = []
+        for w in frontier:
+            for i in range(len(w)):
+                deleted = w[:i] + w[i+1:]
+                if deleted not in variants:
+                    variants.add(deleted)
+                    next_frontier.append(deleted)
+        frontier = next_frontier
+    return variants
+
+
+class SymSpellIndex:
+    """Deletion-neighborhood index over a vocabulary"""
+
+    def __init__(self, words, distance, max_distance=2):
+        """
+        words: iterable of vocabulary words
+        distance: bounded edit distance, called as distance(a, b, max_dist=...)
+        """
+        self.max_distance = max_distance
+        self.distance = distance
+        self.deletes = {}
+        for word in words:
+            for variant in deletion_variants(word, max_distance):
+                self.deletes.setdefault(variant, []).append(word)
+
+    def lookup(self, word, max_distance=None):
+        """Return the set of vocabulary words within max_distance edits of word"""
+        if max_distance is None or max_distance > self.max_distance:
+            max_distance = self.max_distance
+
+        candidates = set()
+        for variant in deletion_variants(word, max_distance):
+            candidates.update(self.deletes.get(variant, ()))
+
+        return {cand for cand in candidates
+                if abs(len(cand) - len(word)) <= max_distance
+                and self.distance(word, cand, max_dist=max_distance) <= max_distance}
+
+    def __len__(self):
+        return len(self.deletes)
@@ -27,6 +27,21 @@ TE_SUFFIXES = (
 
 TELUGU_BLOCK_RE = r'[\u0C00-\u0C7F]+' 
 
+# One Telugu akshara (orthographic syllable): a conjunct of consonants joined by
+# virama with its vowel sign and modifiers, or an independent vowel; any other
+# character stands alone.
+AKSHARA_RE = re.compile(
+    r'(?:[\u0C15-\u0C39\u0C58-\u0C5A]\u0C3C?\u0C4D)*[\u0C15-\u0C39\u0C58-\u0C5A]\u0C3C?'
+    r'[\u0C3E-\u0C4D\u0C55\u0C56]*[\u0C00-\u0C04]*'
+    r'|[\u0C05-\u0C14\u0C60\u0C61][\u0C00-\u0C04]*'
+    r'|.', re.DOTALL)
+
+
+def split_aksharas(word):
+    """Split a word into Telugu aksharas (grapheme clusters); other scripts split per character."""
+    return AKSHARA_RE.findall(word)
+
+
 class SimpleEnglishStemmer:
     """Very small stemmer covering the most common English suffix patterns."""
 
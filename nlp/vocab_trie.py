@@ -0,0 +1,93 @@
+"""
+Trie over a word -> frequency vocabulary with bounded edit-distance lookup.
+
+lookup() walks the trie depth-first, computing one Levenshtein DP row per
+trie edge (Hanov's row-by-row traversal). A subtree is abandoned as soon as
+every cell of its row exceeds max_dist, so only prefixes that can still lead
+to a match are expanded, and shared prefixes are computed once for all the
+words below them.
+"""
+
+
+class _Node:
+    __slots__ = ('children', 'word', 'count')
+
+    def __init__(self):
+        self.children = {}
+        self.word = None
+        self.count = 0
+
+
+class VocabularyTrie:
+    """Prefix tree over a vocabulary with frequency counts"""
+
+    def __init__(self, word_counts=None):
+        self.root = _Node()
+        self.size = 0
+        if word_counts:
+            for word, count in word_counts.items():
+                self.insert(word, count)
+
+    def insert(self, word, count=1):
+        node = self.root
+        for ch in word:
+            child = node.children.get(ch)
+            if child is None:
+                child = node.children[ch] = _Node()
+            node = child
+        if node.word is None:
+            self.size += 1
+        node.word = word
+        node.count = count
+
+    def _find(self, word):
+        node = self.root
+        for ch in word:
+            node = node.children.get(ch)
+            if node is None:
+                return None
+        return node if node.word is not None else None
+
+    def get(self, word, default=None):
+        node = self._find(word)
+        return default if node is None else node.count
+
+    def __contains__(self, word):
+        return self._find(word) is not None
+
+    def __len__(self):
+        return self.size
+
+    def lookup(self, word, max_dist=2, transpositions=False):
+        """
+        Return [(vocab_word, distance, count), ...] for every vocabulary word within
+        max_dist edits of word, most frequent first (ties: closer, then alphabetical).
+        transpositions=True also counts swapping two adjacent characters as one edit
+        (optimal string alignment distance).
+        """
+        n = len(word)
+        results = []
+        if self.root.word is not None and n <= max_dist:
+            results.append((self.root.word, n, self.root.count))
+        first_row = list(range(n + 1))
+        # (node, edge char, parent edge char, parent row, grandparent row)
+        stack = [(child, ch, None, first_row, None) for ch, child in self.root.children.items()]
+        while stack:
+            node, ch, prev_ch, prev_row, prev_prev_row = stack.pop()
+            row = [prev_row[0] + 1]
+            for j in range(1, n + 1):
+                cost = 0 if word[j - 1] == ch else 1
+                value = min(row[j - 1] + 1, prev_row[j] + 1, prev_row[j - 1] + cost)
+                if (transpositions and prev_prev_row is not None and j > 1
+                        and word[j - 1] == prev_ch and word[j - 2] == ch):
+                    value = min(value, prev_prev_row[j - 2] + 1)
+                row.append(value)
+
+            if node.word is not None and row[n] <= max_dist:
+                results.append((node.word, row[n], node.count))
+            if min(row) <= max_dist:
+                for next_ch, child in node.children.items():
+                    stack.append((child, next_ch, ch, row, prev_row))
+
+        results.sort(key=lambda r: (-r[2], r[1], r[0]))
+        return results
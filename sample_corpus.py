@@ -235,11 +235,29 @@ sample_data += [
 ]
 
 
-
+import hashlib
 import json
+import os
 import re
+from collections import Counter
 from pathlib import Path
 
+from utils.json_stream import iter_json_object
+
+PROJECT_DIR = Path(__file__).resolve().parent
+
+# Prebuilt corpus, rebuilt only when one of CORPUS_SOURCES changes
+CORPUS_ARTIFACT = PROJECT_DIR / 'data' / 'sample_corpus.json'
+CORPUS_ARTIFACT_VERSION = 1
+CORPUS_SOURCES = (
+    Path(__file__).resolve(),                         # the paragraph lists above and the assembly below
+    PROJECT_DIR / 'data' / 'labeled_paragraphs.json',
+    PROJECT_DIR / 'nlp' / 'language_detector.py',     # decides each kingdom paragraph's language
+    PROJECT_DIR / 'utils' / 'json_stream.py',         # parses the labeled paragraphs
+)
+
+_corpus = None  # process-wide cache filled by get_sample_corpus()
+
 
 def simple_sentence_tokenize(text):
     """Lightweight sentence splitter using punctuation boundaries."""
@@ -249,30 +267,22 @@ def simple_sentence_tokenize(text):
     parts = re.split(r'(?<=[.!?])\s+', text.strip())
     return [p.strip() for p in parts if p.strip()]
 
-# Read your text file
-with open("cleaned_english_text.txt", "r", encoding="utf-8") as f:
-    text = f.read()
-
-# Split the text into sentences (English heuristic)
-sentences = simple_sentence_tokenize(text)
-len(sentences)
-#en(sentences)
-paras = [" ".join(sentences[i:i+4]) for i in range(0, len(sentences), 4)]
-
-print(paras[60])
-#i have formed paras 
-len(paras)
-from nlp.language_detector import LanguageDetector
-dict_paras = dict()
-lang = 0
-det = LanguageDetector()
-langs = []
-for i in range(404):
-    lang = det.detect_language(paras[i])
-    langs.append(lang['language'])
-
-with open("paragraphs_3","w",encoding = "utf-8") as f:
-    f.write("\n;;;\n".join(paras))
+
+def build_english_paragraphs(source="cleaned_english_text.txt", output="paragraphs_3", sentences_per_paragraph=4):
+    """Group the cleaned English text into paragraphs of 4 sentences and write them ';;;'-separated."""
+    with open(source, "r", encoding="utf-8") as f:
+        text = f.read()
+
+    # Split the text into sentences (English heuristic)
+    sentences = simple_sentence_tokenize(text)
+    paras = [" ".join(sentences[i:i+sentences_per_paragraph])
+             for i in range(0, len(sentences), sentences_per_paragraph)]
+
+    with open(output, "w", encoding="utf-8") as f:
+        f.write("\n;;;\n".join(paras))
+    return paras
+
+
 Kakatiya = ["The kakatiya dynasty (IAST: Kākatīya) was a Telugu dynasty that ruled most of eastern Deccan region in present-day India between 12th and 14th centuries. Their territory comprised much of the present day Telangana and Andhra Pradesh, and parts of eastern Karnataka, northern Tamil Nadu, and southern Odisha. Their capital was Orugallu, now known as Warangal. Early Kakatiya rulers served as feudatories to Rashtrakutas and Western Chalukyas for more than two centuries."
     ,
     "They assumed sovereignty under Prataparudra I in 1163 CE by suppressing other Chalukya subordinates in the Telangana region. Ganapati Deva (r. 1199–1262) significantly expanded Kakatiya lands during the 1230s and brought under Kakatiya control the Telugu-speaking lowland delta areas around the Godavari and Krishna rivers. Ganapati Deva was succeeded by Rudrama Devi (r. 1262–1289) who is one of the few queens in Indian history."
@@ -285,11 +295,6 @@ Kakatiya = ["The kakatiya dynasty (IAST: Kākatīya) was a Telugu dynasty that r
     ,
     "Key rulers include Rudradeva (Prataparudra I), who consolidated power and constructed large irrigation tanks such as Ramappa and Bhadrakali lakes and laid the foundation for Warangal's fortifications. Ganapati Deva (r. 1199–1262) was the most powerful ruler who expanded the kingdom substantially, from Kanchipuram in the south to the Godavari basin in the north and Raichur Doab in the west. He promoted agriculture through large-scale irrigation projects and made the port of Motupalli a major trading hub, fostering prosperity. The exquisite Ramappa Temple was built during his reign by his general Recharla Rudra and is now a UNESCO World Heritage Site."]
 
-lang_kakatiya = []
-for i in Kakatiya :
-    lang = det.detect_language(i)
-    lang_kakatiya.append(lang['language'])
-
     
 
 # Satavahana
@@ -299,12 +304,6 @@ Satavahana = [
 "Notable for being early issuers of state coinage, the Satavahanas played a critical role in bridging cultures between the Indo-Gangetic plains and southern India. They followed Mauryan administrative traditions and included hereditary rulers, feudatories, and ministers in their governance. The Satavahanas were patrons of Brahmanism and Mahayana Buddhism, performed Vedic sacrifices, and made generous donations to Buddhist monasteries. Their territory included fertile river valleys, facilitating trade and agriculture. They controlled significant Indian sea ports, dominating trade with the Roman Empire, as noted in the Periplus of the Erythraean Sea."
 ]
 
-lang_satavahana = []
-for i in Satavahana:
-    lang = det.detect_language(i)
-    lang_satavahana.append(lang['language'])
-
-
 # Chalukya
 Chalukya = [
 "The Chalukya dynasty was a Classical Indian dynasty that ruled large parts of southern and central India between the 6th and the 12th centuries. During this period, they ruled as three related yet individual dynasties. The earliest dynasty, known as the \"Badami Chalukyas\", ruled from Vatapi (modern Badami) from the middle of the 6th century.",
@@ -312,119 +311,180 @@ Chalukya = [
 "Pulakeshin II, arguably the most famous Chalukya ruler, extended the empire across the Deccan, defeated northern and southern rivals, and demonstrated military prowess. The dynasty split into Eastern and Western branches, the former ruling the coastal Andhra region with Telugu literary patronage, and the latter reviving fortunes in the 10th century and fostering Kannada literature as well as Sanskrit scholarship."
 ]
 
-lang_chalukya = []
-for i in Chalukya:
-    lang = det.detect_language(i)
-    lang_chalukya.append(lang['language'])
-
-
 # Vijayanagara
 Vijayanagara = [
 "The Vijayanagara Empire, also known as the Karnata Kingdom, was a late medieval Hindu empire that ruled much of southern India. It was established in 1336 by the brothers Harihara I and Bukka Raya I of the Sangama dynasty, belonging to the Yadava clan of Chandravamsa lineage. The empire rose to prominence as a culmination of attempts by the southern powers to ward off Muslim invasions by the end of the 13th century.",
 "At its peak in the early 16th century under Krishnadevaraya, it subjugated almost all of Southern India's ruling dynasties and pushed the Deccan sultanates beyond the Tungabhadra-Krishna River doab region, in addition to annexing the Gajapati Empire (Odisha) up to the Krishna River, becoming one of the most prominent states in India."
 ]
 
-lang_vijayanagara = []
-for i in Vijayanagara:
-    lang = det.detect_language(i)
-    lang_vijayanagara.append(lang['language'])
-
-
 # Rashtrakuta
 Rashtrakuta = [
 "The Rashtrakuta Empire (Kannada: [raːʂʈrɐkuːʈɐ]) was a royal Indian polity ruling large parts of the Indian subcontinent between the 6th and 10th centuries. The earliest known Rashtrakuta inscription is a 7th-century copper plate grant detailing their rule from Manapur, a city in Central or West India.",
 "At their peak the Rashtrakutas of Manyakheta ruled a vast empire stretching from the Ganges River and Yamuna River doab in the north to Kanyakumari in the south, a fruitful time of political expansion, architectural achievements and famous literary contributions."
 ]
 
-lang_rashtrakuta = []
-for i in Rashtrakuta:
-    lang = det.detect_language(i)
-    lang_rashtrakuta.append(lang['language'])
-
-
 # Chola
 Chola = [
 "The Chola dynasty was a Tamil dynasty originating from Southern India. At its height, it ruled over the Chola Empire, an expansive maritime empire.",
 "The earliest datable references to the Chola are from inscriptions dated to the 3rd century BCE during the reign of Ashoka of the Maurya Empire. The Chola empire was at its peak and achieved imperialism under the Medieval Cholas in the mid-9th century CE."
 ]
 
-lang_chola = []
-for i in Chola:
-    lang = det.detect_language(i)
-    lang_chola.append(lang['language'])
 
+KINGDOM_PARAGRAPHS = {
+    "Kakatiya": Kakatiya,
+    "Satavahana": Satavahana,
+    "Chalukya": Chalukya,
+    "Vijayanagara": Vijayanagara,
+    "Rashtrakuta": Rashtrakuta,
+    "Chola": Chola,
+}
 
-    
-def get_sample_corpus():
+
+def build_sample_corpus():
     """
-    Returns sample corpus data in the expected format.
-    Each item should have: paragraph_id, text, language, kingdom_label
+    Assemble the corpus from its sources: the hand-written entries, the kingdom
+    paragraph lists (language-detected) and the labeled Telugu paragraphs.
+    Each item has: paragraph_id, text, language, kingdom_label
     """
-    def build_corpus_from_kingdoms(kingdom_data):
-        sample_dat = []
-        for kingdom, data in kingdom_data.items():
-            paras = data["paragraphs"]
-            langs = data["languages"]
-
-            for i, (para, lang) in enumerate(zip(paras, langs), start=1):
-                # Create ID in format → kingdom_lang_index (e.g. kakatiya_en_001)
-                paragraph_id = f"{kingdom.lower()}_{lang}_{i:03d}"
-                entry = {
-                    "paragraph_id": paragraph_id,
-                    "text": para.strip(),
-                    "language": lang,
-                    "kingdom_label": kingdom
-                }
-                sample_dat.append(entry)
-        return sample_dat
-
-    kingdom_data = {
-        "Kakatiya": {"paragraphs": Kakatiya, "languages": lang_kakatiya},
-        "Satavahana": {"paragraphs": Satavahana, "languages": lang_satavahana},
-        "Chalukya": {"paragraphs": Chalukya, "languages": lang_chalukya},
-        "Vijayanagara": {"paragraphs": Vijayanagara, "languages": lang_vijayanagara},
-        "Rashtrakuta": {"paragraphs": Rashtrakuta, "languages": lang_rashtrakuta},
-        "Chola": {"paragraphs": Chola, "languages": lang_chola},
-    }
-    sample_dat = build_corpus_from_kingdoms(kingdom_data)
-    sample_data.extend(sample_dat)
+    from nlp.language_detector import LanguageDetector
+
+    det = LanguageDetector()
+    corpus = [dict(e) for e in sample_data]
+
+    for kingdom, paras in KINGDOM_PARAGRAPHS.items():
+        for i, para in enumerate(paras, start=1):
+            lang = det.detect_language(para)['language']
+            # Create ID in format → kingdom_lang_index (e.g. kakatiya_en_001)
+            paragraph_id = f"{kingdom.lower()}_{lang}_{i:03d}"
+            corpus.append({
+                "paragraph_id": paragraph_id,
+                "text": para.strip(),
+                "language": lang,
+                "kingdom_label": kingdom
+            })
+
     # --- Append Telugu paragraphs from the labeled JSON (use first detected kingdom) ---
+    append_labeled_telugu(corpus, PROJECT_DIR / 'data' / 'labeled_paragraphs.json')
+    return corpus
+
+
+class _KeysOutOfOrder(Exception):
+    pass
+
+
+def _in_key_order(items):
+    """Pass (key, item) pairs through, raising _KeysOutOfOrder if keys are not ascending"""
+    last = None
+    for key, item in items:
+        index = int(key)
+        if last is not None and index < last:
+            raise _KeysOutOfOrder()
+        last = index
+        yield key, item
+
+
+def _append_labeled_items(corpus, counts, items):
+    # For each labeled paragraph, if it's Telugu (has Telugu chars) and kingdoms exist,
+    # append to the corpus using the first kingdom label.
+    for key, item in items:
+        para = item.get('paragraph', '').strip()
+        kingdoms = item.get('kingdoms', [])
+        if not para or not kingdoms:
+            continue
+
+        # quick Telugu heuristics: presence of Telugu Unicode block
+        if not any('\u0C00' <= ch <= '\u0C7F' for ch in para):
+            continue
+
+        kingdom = kingdoms[0]
+
+        # build a paragraph id similar to other entries, numbering on from the existing ones
+        counts[(kingdom, 'te')] += 1
+        corpus.append({
+            'paragraph_id': f"{kingdom.lower()}_te_{counts[(kingdom, 'te')]:03d}",
+            'text': para,
+            'language': 'te',
+            'kingdom_label': kingdom
+        })
+
+
+def append_labeled_telugu(corpus, labeled_path):
+    """
+    Append the Telugu paragraphs of a labeled-paragraphs JSON ({index: label info},
+    in index order) to corpus in a single pass: the file is parsed incrementally and
+    ids come from per-(kingdom, language) counters.
+    """
     try:
-        labeled_path = Path(__file__).resolve().parents[0] / 'data' / 'labeled_paragraphs.json'
-        if labeled_path.exists():
+        if not Path(labeled_path).exists():
+            return corpus
+        counts = Counter((e.get('kingdom_label'), e.get('language')) for e in corpus)
+        start = len(corpus)
+        try:
+            _append_labeled_items(corpus, counts.copy(), _in_key_order(iter_json_object(labeled_path)))
+        except _KeysOutOfOrder:
+            # Hand-edited file: fall back to loading and sorting it
+            del corpus[start:]
             with open(labeled_path, 'r', encoding='utf-8') as f:
                 labeled = json.load(f)
-
-            # For each labeled paragraph, if it's Telugu (has Telugu chars) and kingdoms exist,
-            # append to sample_data using the first kingdom label.
-            for key, item in sorted(labeled.items(), key=lambda x: int(x[0])):
-                para = item.get('paragraph', '').strip()
-                kingdoms = item.get('kingdoms', [])
-                if not para or not kingdoms:
-                    continue
-
-                # quick Telugu heuristics: presence of Telugu Unicode block
-                if not any('\u0C00' <= ch <= '\u0C7F' for ch in para):
-                    continue
-
-                kingdom = kingdoms[0]
-
-                # build a paragraph id similar to other entries, avoid collision by counting existing
-                existing_count = sum(1 for e in sample_data if e.get('kingdom_label') == kingdom and e.get('language') == 'te')
-                paragraph_id = f"{kingdom.lower()}_te_{existing_count+1:03d}"
-
-                entry = {
-                    'paragraph_id': paragraph_id,
-                    'text': para,
-                    'language': 'te',
-                    'kingdom_label': kingdom
-                }
-                sample_data.append(entry)
+            _append_labeled_items(corpus, counts, sorted(labeled.items(), key=lambda x: int(x[0])))
     except Exception:
         # keep function robust if file missing or malformed
         pass
+    return corpus
+
+
+def source_fingerprint():
+    """SHA-256 of every corpus source file (None for a missing file)"""
+    fingerprint = {}
+    for path in CORPUS_SOURCES:
+        try:
+            fingerprint[path.relative_to(PROJECT_DIR).as_posix()] = hashlib.sha256(path.read_bytes()).hexdigest()
+        except OSError:
+            fingerprint[path.relative_to(PROJECT_DIR).as_posix()] = None
+    return fingerprint
+
+
+def load_corpus_artifact(path=CORPUS_ARTIFACT):
+    """The prebuilt corpus, or None if the artifact is missing, unreadable or stale"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get('version') != CORPUS_ARTIFACT_VERSION or data.get('fingerprint') != source_fingerprint():
+        return None
+    return data.get('corpus')
+
+
+def write_corpus_artifact(corpus, path=CORPUS_ARTIFACT):
+    """Write the corpus with its source fingerprint (atomically, so concurrent workers never see a partial file)"""
+    data = {'version': CORPUS_ARTIFACT_VERSION, 'fingerprint': source_fingerprint(), 'corpus': corpus}
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def get_sample_corpus(rebuild=False):
+    """
+    Returns sample corpus data in the expected format.
+    Each item should have: paragraph_id, text, language, kingdom_label
+
+    Loaded once per process: from the prebuilt artifact when its source
+    fingerprint still matches, else built and the artifact refreshed.
+    """
+    global _corpus
+    if _corpus is None or rebuild:
+        corpus = None if rebuild else load_corpus_artifact()
+        if corpus is None:
+            corpus = build_sample_corpus()
+            try:
+                write_corpus_artifact(corpus)
+            except OSError as e:
+                print(f"Could not write corpus artifact: {e}")
+        _corpus = corpus
+    return [dict(e) for e in _corpus]
 
-    return sample_data
 
 # Function to get corpus statistics
 def get_corpus_stats(corpus_data):
@@ -458,3 +518,10 @@ def get_corpus_stats(corpus_data):
     
     stats['kingdoms'] = list(stats['kingdoms'])
     return stats
+
+
+if __name__ == '__main__':
+    # Offline build: regenerate the English paragraphs file and the corpus artifact
+    build_english_paragraphs()
+    corpus = get_sample_corpus(rebuild=True)
+    print(f"Wrote {len(corpus)} paragraphs to {CORPUS_ARTIFACT}")
@@ -2,56 +2,132 @@
 Helper functions and utilities for the kingdom history chatbot
 """
 
+import hashlib
 import os
 import pickle
+import time
 from nlp.language_detector import LanguageDetector
 from nlp.text_processor import TextProcessor
 from nlp.spell_corrector import SpellCorrector
 from nlp.intent_detector import IntentDetector
 from nlp.retrieval_system import RetrievalSystem
 from nlp.query_expander import QueryExpander
-from nlp.bigram import NgramSpellChecker
-from sample_corpus import get_sample_corpus
+from nlp.bigram import JSON_FILES, NgramSpellChecker
+from nlp.spell_index import FORMAT_VERSION as SPELL_INDEX_VERSION, MappedSpellIndex, build_spell_index
+from sample_corpus import get_sample_corpus, source_fingerprint
 from data.gazetteer import get_gazetteer, get_all_protected_words
+from utils.snapshot import DEFAULT_SNAPSHOT_DIR, Snapshot, input_key, warm_start
 
-def initialize_system():
-    """Initialize all system components"""
+# Source files each snapshotted component is built by; editing one invalidates its snapshot
+RETRIEVAL_SOURCES = ('nlp/retrieval_system.py', 'nlp/index_store.py')
+SPELL_SOURCES = ('nlp/spell_index.py', 'nlp/index_store.py')
+INTENT_SOURCES = ('nlp/intent_detector.py', 'nlp/aho_corasick.py')
+EXPANDER_SOURCES = ('nlp/query_expander.py',)
+
+# Version of the save_system_state envelope; bump when a pickled component's layout changes
+# (2: RetrievalSystem.query_cache is a ResultCache; 3: QgramCountIndex holds its distance function;
+#  4: CompactShard carries a delta of updates; 5: RetrievalSystem keeps per-document norm sums
+#  and SparseTfidfIndex stores raw counts)
+SYSTEM_STATE_VERSION = 5
+
+
+def _report(label, source, seconds):
+    print(f"  {label:<22} {source:<9} {seconds * 1000:8.1f} ms")
+
+
+def _load_spell_indices(spell_corrector, snapshot_dir):
+    """Make every language's n-gram index resident in spell_corrector, via snapshots"""
+    for language, json_file in JSON_FILES.items():
+        snapshot = None
+        if snapshot_dir is not None:
+            snapshot = Snapshot(snapshot_dir, f"spell-{language}", '.spellidx', SPELL_INDEX_VERSION,
+                                input_key(SPELL_SOURCES + (json_file,)))
+
+        def use(snap, language=language):
+            spell_corrector.use_spell_index(language, MappedSpellIndex(str(snap.path)))
+            return spell_corrector
+
+        def build(snapshot=snapshot, language=language, json_file=json_file):
+            # The artifact is the build output, so write it first and map it
+            if snapshot is not None:
+                try:
+                    snapshot.write(lambda path: build_spell_index(json_file, path))
+                    return use(snapshot)
+                except OSError as e:
+                    print(f"Could not write snapshot {snapshot.path}: {e}")
+            spell_corrector.load_json(language)
+            return spell_corrector
+
+        _, source, seconds = warm_start(snapshot, use, build, lambda snap, checker: None)
+        _report(f"spell index ({language})", source, seconds)
+
+
+def initialize_system(snapshot_dir=DEFAULT_SNAPSHOT_DIR):
+    """
+    Initialize all system components.
+
+    The retrieval index, the spell checker's n-gram indices, the intent
+    detector's automaton and the query expansion dictionary are loaded from
+    warm-start snapshots in snapshot_dir (see utils/snapshot.py) when their
+    inputs are unchanged, and rebuilt (and re-snapshotted) otherwise.
+    snapshot_dir=None builds everything from scratch and writes nothing.
+    Prints how long each component took and where it came from.
+    """
     print("Initializing Kingdom History Chatbot...")
-    
-    # Initialize components
-    print("Loading language detector...")
+    total_start = time.perf_counter()
+
+    start = time.perf_counter()
     lang_detector = LanguageDetector()
-    
-    print("Loading text processor...")
+    _report("language detector", 'built', time.perf_counter() - start)
+
+    start = time.perf_counter()
     text_processor = TextProcessor()
-    
-    print("Loading spell corrector...")
+    _report("text processor", 'built', time.perf_counter() - start)
+
     spell_corrector = NgramSpellChecker()
-    
+    _load_spell_indices(spell_corrector, snapshot_dir)
+
     # Add protected words from gazetteer
     #protected_words = get_all_protected_words()
     #spell_corrector.add_protected_words(protected_words)
-    
-    print("Loading gazetteer...")
+
+    start = time.perf_counter()
     gazetteer = get_gazetteer()
-    
-    print("Loading intent detector...")
-    intent_detector = IntentDetector(gazetteer)
-    
-    print("Loading query expander...")
-    query_expander = QueryExpander(gazetteer)
-    
-    print("Loading corpus data...")
-    corpus_data = get_sample_corpus()
-    
-    print("Building retrieval index...")
-    retrieval_system = RetrievalSystem(corpus_data)
-    
-    
-    
-    
-    
-    print("System initialization complete!")
+    _report("gazetteer", 'built', time.perf_counter() - start)
+
+    def pickled(name, version, sources, build):
+        snapshot = None
+        if snapshot_dir is not None:
+            snapshot = Snapshot(snapshot_dir, name, '.pkl', version, input_key(sources, gazetteer))
+        return warm_start(snapshot, Snapshot.load_pickle, build, Snapshot.write_pickle)
+
+    intent_detector, source, seconds = pickled('intent', 1, INTENT_SOURCES, lambda: IntentDetector(gazetteer))
+    _report("intent detector", source, seconds)
+
+    query_expander, source, seconds = pickled('expander', 1, EXPANDER_SOURCES, lambda: QueryExpander(gazetteer))
+    _report("query expander", source, seconds)
+
+    # The corpus is only read when the retrieval index has to be rebuilt
+    retrieval_snapshot = None
+    if snapshot_dir is not None:
+        retrieval_snapshot = Snapshot(snapshot_dir, 'retrieval', '.idx', RetrievalSystem.INDEX_VERSION,
+                                      input_key(RETRIEVAL_SOURCES, source_fingerprint()))
+
+    def load_retrieval(snap):
+        system = RetrievalSystem()
+        if not system.load_index(str(snap.path)):
+            raise OSError(f"{snap.path} is missing")
+        return system
+
+    retrieval_system, source, seconds = warm_start(
+        retrieval_snapshot,
+        load_retrieval,
+        lambda: RetrievalSystem(get_sample_corpus()),
+        lambda snap, system: snap.write(system.save_index),
+    )
+    _report("retrieval index", source, seconds)
+
+    print(f"System initialization complete! ({(time.perf_counter() - total_start) * 1000:.1f} ms)")
     
     # Print system stats
     stats = retrieval_system.get_index_stats()
@@ -76,22 +152,33 @@ def initialize_system():
     }
 
 def save_system_state(components, filepath):
-    """Save system state to disk"""
+    """Save system state to disk, with a format version and checksum load_system_state verifies"""
     try:
+        payload = pickle.dumps(components)
         with open(filepath, 'wb') as f:
-            pickle.dump(components, f)
+            pickle.dump({
+                'state_version': SYSTEM_STATE_VERSION,
+                'sha256': hashlib.sha256(payload).hexdigest(),
+                'payload': payload,
+            }, f)
         return True
     except Exception as e:
         print(f"Error saving system state: {e}")
         return False
 
 def load_system_state(filepath):
-    """Load system state from disk"""
+    """Load system state from disk; None if missing, from another version or corrupt"""
     try:
         if os.path.exists(filepath):
             with open(filepath, 'rb') as f:
-                components = pickle.load(f)
-            return components
+                state = pickle.load(f)
+            if not isinstance(state, dict) or state.get('state_version') != SYSTEM_STATE_VERSION:
+                print("Ignoring system state: saved by an incompatible version")
+                return None
+            if hashlib.sha256(state['payload']).hexdigest() != state['sha256']:
+                print("Ignoring system state: checksum mismatch")
+                return None
+            return pickle.loads(state['payload'])
         return None
     except Exception as e:
         print(f"Error loading system state: {e}")
@@ -0,0 +1,71 @@
+"""
+Incremental reader for large JSON files whose top level is an object, such as
+data/labeled_paragraphs.json: members are decoded one at a time from a
+chunked read, so memory holds one value rather than the whole document.
+"""
+
+import json
+
+_WHITESPACE = ' \t\n\r'
+
+
+def iter_json_object(filepath, chunk_chars=1 << 16):
+    """Yield the (key, value) members of the top-level JSON object in file order."""
+    decoder = json.JSONDecoder()
+    with open(filepath, 'r', encoding='utf-8') as f:
+        buf, pos, eof = '', 0, False
+
+        def read_more():
+            nonlocal buf, pos, eof
+            chunk = f.read(chunk_chars)
+            if not chunk:
+                eof = True
+                return False
+            buf = buf[pos:] + chunk  # drop what has been consumed
+            pos = 0
+            return True
+
+        def skip_whitespace():
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in _WHITESPACE:
+                    pos += 1
+                if pos < len(buf) or not read_more():
+                    return
+
+        def expect(chars):
+            nonlocal pos
+            skip_whitespace()
+            if pos >= len(buf) or buf[pos] not in chars:
+                found = buf[pos] if pos < len(buf) else 'end of file'
+                raise ValueError(f"{filepath}: expected one of {chars!r}, found {found!r}")
+            pos += 1
+            return buf[pos - 1]
+
+        def decode():
+            nonlocal pos
+            skip_whitespace()
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buf, pos)
+                    # A value ending exactly at the buffer end (e.g. a number) may continue
+                    if end < len(buf) or eof:
+                        pos = end
+                        return value
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                read_more()
+
+        expect('{')
+        skip_whitespace()
+        if pos < len(buf) and buf[pos] == '}':
+            return
+        while True:
+            key = decode()
+            if not isinstance(key, str):
+                raise ValueError(f"{filepath}: object keys must be strings")
+            expect(':')
+            yield key, decode()
+            if expect(',}') == '}':
+                return
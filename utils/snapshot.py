@@ -0,0 +1,132 @@
+"""
+Warm-start snapshots of the chatbot components.
+
+Every component built by initialize_system is saved to its own artifact in
+the snapshot directory, next to a small JSON manifest:
+
+    snapshots/retrieval.idx       snapshots/retrieval.json
+    snapshots/spell-te.spellidx   snapshots/spell-te.json
+    ...
+
+The manifest records the artifact's format version, a key hashing the
+component's inputs (data files, the source of the modules that build it and
+any other values it depends on) and the SHA-256 of the artifact itself. An
+artifact is loaded only when all three match; otherwise the component is
+rebuilt and its snapshot rewritten. Artifacts and manifests are written to a
+temporary file and renamed into place, so a reader never sees a partial file.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+DEFAULT_SNAPSHOT_DIR = PROJECT_DIR / 'snapshots'
+
+# Bump to invalidate every snapshot (manifest layout changes)
+SNAPSHOT_VERSION = 1
+
+
+def file_digest(path):
+    """SHA-256 of a file's contents, or None if it cannot be read"""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def input_key(files=(), values=None):
+    """
+    Hash of a component's inputs: the contents of `files` (paths relative to
+    the project root) and any JSON-serializable `values`.
+    """
+    inputs = {
+        'files': {str(f): file_digest(PROJECT_DIR / f) for f in files},
+        'values': values,
+    }
+    encoded = json.dumps(inputs, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class Snapshot:
+    """One component's artifact and manifest in a snapshot directory"""
+
+    def __init__(self, directory, name, suffix, version, key):
+        self.directory = Path(directory)
+        self.name = name
+        self.path = self.directory / f"{name}{suffix}"
+        self.manifest_path = self.directory / f"{name}.json"
+        self.version = version
+        self.key = key
+
+    def is_valid(self):
+        """True if the artifact exists, was built from the same inputs and is intact"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return False
+        return (manifest.get('snapshot_version') == SNAPSHOT_VERSION
+                and manifest.get('version') == self.version
+                and manifest.get('input_key') == self.key
+                and manifest.get('sha256') == file_digest(self.path))
+
+    def write(self, write_artifact):
+        """Call write_artifact(tmp_path) to produce the artifact, then publish it and its manifest"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        write_artifact(str(tmp))
+        os.replace(tmp, self.path)
+
+        manifest = {
+            'snapshot_version': SNAPSHOT_VERSION,
+            'component': self.name,
+            'version': self.version,
+            'input_key': self.key,
+            'sha256': file_digest(self.path),
+            'size': self.path.stat().st_size,
+        }
+        tmp = self.manifest_path.with_name(f"{self.manifest_path.name}.{os.getpid()}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp, self.manifest_path)
+
+    def load_pickle(self):
+        with open(self.path, 'rb') as f:
+            return pickle.load(f)
+
+    def write_pickle(self, obj):
+        def dump(path):
+            with open(path, 'wb') as f:
+                pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self.write(dump)
+
+
+def warm_start(snapshot, load, build, save):
+    """
+    Load a component from `snapshot` if it is valid, else build() it and save() it
+    (save errors are reported, not raised). snapshot=None always builds.
+    Returns (component, 'snapshot' | 'rebuilt' | 'built', seconds).
+    """
+    start = time.perf_counter()
+    if snapshot is not None and snapshot.is_valid():
+        try:
+            return load(snapshot), 'snapshot', time.perf_counter() - start
+        except Exception as e:
+            print(f"Could not load snapshot {snapshot.path}: {e}")
+
+    component = build()
+    if snapshot is None:
+        return component, 'built', time.perf_counter() - start
+    try:
+        save(snapshot, component)
+    except Exception as e:
+        print(f"Could not write snapshot {snapshot.path}: {e}")
+    return component, 'rebuilt', time.perf_counter() - start